@@ -0,0 +1,58 @@
+"""
+Benchmark of the per-job overhead of getting a SpotDL downloader.
+
+Compares creating and closing a Downloader for every job (the previous behaviour)
+with checking one out of the shared DownloaderRuntime. No songs are downloaded.
+
+Run from the repository root with the bot's environment variables set:
+
+    python -m benchmarks.downloader_overhead --jobs 50
+"""
+
+import argparse
+import time
+
+from spotdl.utils.config import DOWNLOADER_OPTIONS
+
+from spotifyDownloader.runtime import DownloaderRuntime, LimitedDownloader
+
+
+def per_job_downloader(jobs: int) -> float:
+    settings = DOWNLOADER_OPTIONS.copy()
+    settings["simple_tui"] = True
+    start = time.perf_counter()
+    for _ in range(jobs):
+        downloader = LimitedDownloader(settings=dict(settings), loop=None)
+        downloader.settings["output"] = "{artists} - {title}.{output-ext}"
+        downloader.progress_handler.close()
+    return time.perf_counter() - start
+
+
+def shared_runtime(jobs: int) -> float:
+    runtime = DownloaderRuntime()
+    start = time.perf_counter()
+    for _ in range(jobs):
+        with runtime.downloader(output="{artists} - {title}.{output-ext}"):
+            pass
+    elapsed = time.perf_counter() - start
+    runtime.close()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=50, help="number of simulated jobs")
+    args = parser.parse_args()
+
+    before = per_job_downloader(args.jobs)
+    after = shared_runtime(args.jobs)
+
+    print(f"jobs: {args.jobs}")
+    print(f"new downloader per job: {before * 1000 / args.jobs:8.2f} ms/job")
+    print(f"shared runtime:         {after * 1000 / args.jobs:8.2f} ms/job")
+    if after:
+        print(f"speedup:                {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
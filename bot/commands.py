@@ -1,12 +1,17 @@
 import threading
 from spotifyDownloader import SpotifyDownloader
+from spotifyDownloader.jobs import JobQueue
+from spotifyDownloader.periodic import PeriodicSync
 from settings.settings import VERSION
 from core.locale import get_text
 from core.utils import delete_message, is_spotify_url, parse_call_data, send_message
+from loguru import logger
 import telebot
 from telebot.types import InlineKeyboardButton, InlineKeyboardMarkup
 
 spotdl = SpotifyDownloader()
+jobs = JobQueue(spotdl)
+periodic = PeriodicSync(jobs)
 
 
 def register_commands(bot: telebot.TeleBot):
@@ -14,6 +19,23 @@ def register_commands(bot: telebot.TeleBot):
     Registers all available commands in the Telegram bot.
     """
 
+    def enqueue_job(command: str, query: str) -> None:
+        """Queues a download, sync or plan job and acknowledges it."""
+        _, queued = jobs.submit(command, query)
+        text = get_text("job_queued") if queued else get_text("job_already_queued")
+        # The job runs whether or not the acknowledgement is delivered
+        try:
+            message = send_message(bot, message=text)
+        except Exception as e:
+            logger.error(f"Error acknowledging {command} job for '{query}': {e}")
+            return
+        if message is None:
+            logger.error(f"Error acknowledging {command} job for '{query}'")
+            return
+        threading.Timer(
+            15, delete_message, args=(bot,), kwargs={"message_id": message.message_id}
+        ).start()
+
     # --- Basic commands ---
     @bot.message_handler(commands=["start"])
     def start_command(message):
@@ -41,55 +63,72 @@ def register_commands(bot: telebot.TeleBot):
                 get_text("button_download_user_playlists"),
                 callback_data="download|all-user-playlists",
             ),
-            # InlineKeyboardButton(
-            #     get_text("button_download_user_followed_artists"),
-            #     callback_data="download|all-user-followed-artists"
-            # ),
+            InlineKeyboardButton(
+                get_text("button_download_user_followed_artists"),
+                callback_data="download|all-user-followed-artists",
+            ),
         )
         send_message(
             bot=bot, message=get_text("download_menu_prompt"), reply_markup=markup
         )
 
-    @bot.message_handler(commands=["sync"])
-    def sync_command(message):
+    def sync_markup(command: str) -> InlineKeyboardMarkup:
+        """Builds the menu of sync types for the given command."""
         markup = InlineKeyboardMarkup(row_width=1)
         markup.add(
             InlineKeyboardButton(
-                get_text("button_sync_songs"), callback_data="sync|songs"
+                get_text("button_sync_songs"), callback_data=f"{command}|songs"
             ),
             InlineKeyboardButton(
                 get_text("button_sync_albums"),
-                callback_data="sync|albums",
+                callback_data=f"{command}|albums",
             ),
             InlineKeyboardButton(
                 get_text("button_sync_artists"),
-                callback_data="sync|artists",
+                callback_data=f"{command}|artists",
             ),
             InlineKeyboardButton(
                 get_text("button_sync_playlists"),
-                callback_data="sync|playlists",
+                callback_data=f"{command}|playlists",
             ),
             InlineKeyboardButton(
-                get_text("button_sync_saved_songs"), callback_data="sync|saved"
+                get_text("button_sync_saved_songs"), callback_data=f"{command}|saved"
             ),
             InlineKeyboardButton(
                 get_text("button_sync_saved_albums"),
-                callback_data="sync|all-user-saved-albums",
+                callback_data=f"{command}|all-user-saved-albums",
             ),
             InlineKeyboardButton(
                 get_text("button_sync_saved_playlists"),
-                callback_data="sync|all-saved-playlists",
+                callback_data=f"{command}|all-saved-playlists",
             ),
             InlineKeyboardButton(
                 get_text("button_sync_user_playlists"),
-                callback_data="sync|all-user-playlists",
+                callback_data=f"{command}|all-user-playlists",
             ),
-            # InlineKeyboardButton(
-            #     get_text("button_sync_user_followed_artists"),
-            #     callback_data="sync|all-user-followed-artists"
-            # ),
+            InlineKeyboardButton(
+                get_text("button_sync_user_followed_artists"),
+                callback_data=f"{command}|all-user-followed-artists",
+            ),
+        )
+        return markup
+
+    @bot.message_handler(commands=["sync"])
+    def sync_command(message):
+        send_message(
+            bot=bot,
+            message=get_text("sync_menu_prompt"),
+            reply_markup=sync_markup("sync"),
+        )
+
+    @bot.message_handler(commands=["plan"])
+    def plan_command(message):
+        """Shows what a sync would change, without changing anything."""
+        send_message(
+            bot=bot,
+            message=get_text("plan_menu_prompt"),
+            reply_markup=sync_markup("plan"),
         )
-        send_message(bot=bot, message=get_text("sync_menu_prompt"), reply_markup=markup)
 
     # --- Utilities ---
     @bot.message_handler(commands=["version"])
@@ -122,10 +161,8 @@ def register_commands(bot: telebot.TeleBot):
         comando = data["comando"]
         query = data.get("query")
 
-        if comando == "download":
-            spotdl.download(bot=bot, query=query)
-        elif comando == "sync":
-            spotdl.sync(bot=bot, query=query)
+        if comando in ("download", "sync", "plan"):
+            enqueue_job(comando, query)
         else:
             return
 
@@ -135,7 +172,7 @@ def register_commands(bot: telebot.TeleBot):
         """Processes a Spotify URL directly."""
         try:
             url = message.text.strip()
-            spotdl.download(bot=bot, query=url)
+            enqueue_job("download", url)
         except Exception as e:
             bot.reply_to(message, get_text("error_generic"))
 
@@ -153,6 +190,7 @@ def register_commands(bot: telebot.TeleBot):
             telebot.types.BotCommand("/start", get_text("menu_option_start")),
             telebot.types.BotCommand("/download", get_text("menu_option_download")),
             telebot.types.BotCommand("/sync", get_text("menu_option_sync")),
+            telebot.types.BotCommand("/plan", get_text("menu_option_plan")),
             telebot.types.BotCommand("/version", get_text("menu_option_version")),
             telebot.types.BotCommand("/donate", get_text("menu_option_donate")),
         ]
@@ -1,5 +1,5 @@
 from settings.settings import TELEGRAM_TOKEN, VERSION
-from bot.commands import register_commands
+from bot.commands import jobs, periodic, register_commands
 from core.locale import get_text
 from core.utils import send_message
 from loguru import logger
@@ -27,6 +27,9 @@ def run_bot() -> None:
 
     send_message(bot, message=starting_message)
 
+    jobs.start(bot)
+    periodic.start()
+
     try:
         bot.infinity_polling(60)
     except Exception as e:
@@ -38,9 +38,64 @@ SPOTIFY_REDIRECT_URI = os.getenv("SPOTIFY_REDIRECT_URI")
 CALL_PATTERNS = {
     "download": ["query"],
     "sync": ["query"],
+    "plan": ["query"],
 }
 
 
+def get_int_env(var_name, default):
+    """
+    Reads an integer environment variable.
+    Falls back to the default (and logs a warning) if it is not a valid integer.
+    """
+    value = os.getenv(var_name)
+    if value is None or not value.strip():
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(f"Invalid integer in `{var_name}`: {value}. Using {default}.")
+        return default
+
+
+# Job queue configuration
+DOWNLOAD_WORKERS = max(1, get_int_env("DOWNLOAD_WORKERS", 2))
+
+# Job scheduling: maximum seconds a job should wait before starting, per class
+INTERACTIVE_LATENCY_TARGET = get_int_env("INTERACTIVE_LATENCY_TARGET", 60)
+BULK_LATENCY_TARGET = get_int_env("BULK_LATENCY_TARGET", 3600)
+# Downloads with more songs than this are scheduled as bulk jobs
+SMALL_JOB_MAX_SONGS = get_int_env("SMALL_JOB_MAX_SONGS", 50)
+# Bulk jobs download in batches of this many songs, yielding to short jobs in between
+SONG_BATCH_SIZE = max(1, get_int_env("SONG_BATCH_SIZE", 25))
+
+# Concurrency budgets shared by all jobs
+SYNC_CONCURRENCY = max(1, get_int_env("SYNC_CONCURRENCY", 4))
+SPOTIFY_CONCURRENCY = max(1, get_int_env("SPOTIFY_CONCURRENCY", 4))
+DOWNLOAD_CONCURRENCY = max(1, get_int_env("DOWNLOAD_CONCURRENCY", 4))
+# Spotify requests per second shared by all jobs, and retries of rate limited requests
+SPOTIFY_REQUESTS_PER_SECOND = max(1, get_int_env("SPOTIFY_REQUESTS_PER_SECOND", 10))
+SPOTIFY_MAX_RETRIES = max(0, get_int_env("SPOTIFY_MAX_RETRIES", 5))
+# Processes for ffmpeg conversion and metadata embedding (0 runs them in-process)
+CONVERSION_WORKERS = max(0, get_int_env("CONVERSION_WORKERS", os.cpu_count() or 1))
+# Renames and deletes of a sync applied in parallel (suited to network filesystems)
+FILE_OPS_CONCURRENCY = max(1, get_int_env("FILE_OPS_CONCURRENCY", 8))
+# Cover images downloaded at once
+COVER_CONCURRENCY = max(1, get_int_env("COVER_CONCURRENCY", 8))
+
+# Minimum seconds between edits of the progress messages in the Telegram chat
+PROGRESS_EDIT_SECONDS = max(1, get_int_env("PROGRESS_EDIT_SECONDS", 3))
+
+# Size limit of the Spotify metadata cache in CACHE_DIR (0 disables it)
+METADATA_CACHE_MAX_MB = max(0, get_int_env("METADATA_CACHE_MAX_MB", 64))
+# Hours between full listings of the saved tracks; syncs in between only fetch new ones
+SAVED_FULL_SYNC_HOURS = max(1, get_int_env("SAVED_FULL_SYNC_HOURS", 168))
+
+# Periodic syncs as "category=minutes" pairs, e.g. "saved=60,playlists=360" (empty disables)
+SYNC_SCHEDULE = os.getenv("SYNC_SCHEDULE", "")
+# Random delay added to every periodic sync, as a percentage of its interval
+SYNC_JITTER_PERCENT = min(100, max(0, get_int_env("SYNC_JITTER_PERCENT", 10)))
+
+
 def require_env(var_value, var_name, description):
     """
     Validates that a required environment variable is set.
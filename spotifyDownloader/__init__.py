@@ -5,34 +5,49 @@ from settings.settings import (
     SPOTIFY_CLIENT_ID,
     SPOTIFY_CLIENT_SECRET,
     CACHE_DIR,
+    SONG_BATCH_SIZE,
+    SPOTIFY_CONCURRENCY,
+    SYNC_CONCURRENCY,
 )
 from core.locale import get_text
 from core.utils import delete_message, send_message
-from typing import List, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
-import json
-import requests
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait
 import re
-from spotifyDownloader.artist import Artist
+import threading
+import time
+from spotifyDownloader.artist import Artist, ArtistProfile
+from spotifyDownloader.checkpoint import Checkpoint
+from spotifyDownloader.covers import CoverFetcher
+from spotifyDownloader.journal import FileJournal, delete_op, rename_op
+from spotifyDownloader.library import LibraryIndex
+from spotifyDownloader.limits import spotify_calls
+from spotifyDownloader.m3u import M3U_REFRESH_SECONDS, M3UWriter
+from spotifyDownloader.progress import JobProgress, progress_board
+from spotifyDownloader.ratelimit import get_spotify_client, rate_limiter
+from spotifyDownloader.metadata_cache import (
+    load_song,
+    load_song_list,
+    metadata_cache,
+    spotify_id,
+)
+from spotifyDownloader.runtime import DownloaderRuntime
+from spotifyDownloader.saved import load_saved
+from spotifyDownloader.sync_diff import SyncDiff, SyncPlan
+from spotifyDownloader.sync_store import SyncStore
 import telebot
 from loguru import logger
 from spotdl.utils.config import DEFAULT_CONFIG, DOWNLOADER_OPTIONS
 from spotdl.download.downloader import Downloader
 from spotdl.utils.spotify import SpotifyClient, SpotifyError
-from spotdl.utils.m3u import create_m3u_content
-from spotdl.utils.search import (
-    get_all_user_playlists,
-    get_user_saved_albums,
-    get_all_saved_playlists,
-    parse_query,
-)
 from spotdl.utils.formatter import create_file_name
 from spotdl.types.playlist import Playlist
 from spotdl.types.album import Album
-from spotdl.types.saved import Saved
 from spotdl.types.song import Song, SongList
 
-SYNC_JSON_PATH = f"{CACHE_DIR}/sync.spotdl"
+if TYPE_CHECKING:
+    from spotifyDownloader.jobs import Job
 
 
 class SpotifyDownloader:
@@ -42,6 +57,14 @@ class SpotifyDownloader:
     """
 
     def __init__(self) -> None:
+        self.sync_store = SyncStore()
+        self.runtime = DownloaderRuntime()
+        self.library = LibraryIndex()
+        self.journal = FileJournal()
+        self.covers = CoverFetcher()
+        self.m3u = M3UWriter()
+        self._inflight: Dict[Tuple[str, str], Future] = {}
+        self._inflight_lock = threading.Lock()
         self._init_spotify_client()
 
     def _init_spotify_client(self) -> None:
@@ -53,6 +76,109 @@ class SpotifyDownloader:
             no_cache=DEFAULT_CONFIG["no_cache"],
             headless=DEFAULT_CONFIG["headless"],
         )
+        # spotdl reuses this client, so its requests are rate limited too
+        spotify_client = get_spotify_client()
+        # no_cache also keeps the OAuth token in memory only, so it is turned off
+        # after init: responses must not be memoized for the life of the process,
+        # or syncs, snapshots and saved tracks never see changes on Spotify. The
+        # metadata cache already caches what can be cached.
+        spotify_client.no_cache = True
+        spotify_client.cache.clear()
+
+    def start(self) -> None:
+        """
+        Completes the file operations of an interrupted sync, starts the downloader
+        runtime and rebuilds the library index in the background. Must be called
+        before any job thread starts.
+        """
+        self.journal.replay()
+        self.runtime.start()
+        threading.Thread(
+            target=self._rebuild_library, name="library-index", daemon=True
+        ).start()
+
+    def _rebuild_library(self) -> None:
+        """
+        Rebuilds the library index from the files on disk and the sync entries.
+        """
+        try:
+            entries = [
+                entry
+                for sync_type in self.sync_store.sync_types()
+                for entry in self.sync_store.get_entries(sync_type)
+            ]
+            self.library.rebuild(
+                entries,
+                self.runtime.settings["format"],
+                self.runtime.settings["restrict"],
+            )
+        except Exception as e:
+            logger.error(f"Error rebuilding library index: {e}")
+
+    def _skip_downloaded(
+        self,
+        downloader: Downloader,
+        songs: List[Song],
+        checkpoint: Checkpoint | None = None,
+    ) -> Tuple[List[Song], List[Song]]:
+        """
+        Filters out the songs whose file is already in the library index, so they
+        are not searched on the audio providers again. Tracks already downloaded to
+        another path, e.g. in another playlist, are linked instead.
+        Args:
+            downloader (Downloader): SpotDL Downloader instance.
+            songs (List[Song]): Songs to download.
+            checkpoint (Checkpoint | None): Checkpoint to record skipped songs in.
+        Returns:
+            Tuple[List[Song], List[Song]]: The songs that still have to be downloaded
+                and the repeats of those songs, to link once they are downloaded.
+        """
+        if downloader.settings.get("overwrite") == "force" or not songs:
+            return songs, []
+        missing, present, repeated = self.library.missing(
+            songs,
+            downloader.settings["output"],
+            downloader.settings["format"],
+            downloader.settings["restrict"],
+            # Each copy is tagged with its playlist's track number or cover
+            link=not (
+                downloader.settings.get("playlist_numbering")
+                or downloader.settings.get("playlist_retain_track_cover")
+            ),
+        )
+        if present:
+            logger.info(f"Skipping {len(present)} songs already in the library")
+            if checkpoint:
+                checkpoint.mark_done(present)
+        return missing, repeated
+
+    def _link_repeated(
+        self,
+        downloader: Downloader,
+        songs: List[Song],
+        checkpoint: Checkpoint | None = None,
+    ) -> None:
+        """
+        Links the repeated songs to the files downloaded for their first occurrence.
+        Args:
+            downloader (Downloader): SpotDL Downloader instance.
+            songs (List[Song]): The repeated songs returned by `_skip_downloaded`.
+            checkpoint (Checkpoint | None): Checkpoint to record linked songs in.
+        """
+        if not songs:
+            return
+        linked = self.library.link_repeated(
+            songs,
+            downloader.settings["output"],
+            downloader.settings["format"],
+            downloader.settings["restrict"],
+        )
+        logger.info(f"Linked {len(linked)} of {len(songs)} repeated songs")
+        if checkpoint:
+            checkpoint.mark_done(linked)
+        progress = getattr(downloader, "progress", None)
+        if progress:
+            progress.add(done=len(linked), failed=len(songs) - len(linked))
 
     @staticmethod
     def _is_spotify_playlist(query: str) -> bool:
@@ -175,63 +301,13 @@ class SpotifyDownloader:
         else:
             return "{artists} - {title}.{output-ext}"
 
-    def _create_downloader(self) -> Downloader:
-        """
-        Creates a SpotDL Downloader instance with the given output pattern.
-        """
-        settings = DOWNLOADER_OPTIONS.copy()
-        return Downloader(settings=settings, loop=None)
-
-    def _close_downloader(self, downloader: Downloader) -> None:
-        """
-        Closes the downloader's progress handler to avoid file descriptor leaks.
-        """
-        if hasattr(downloader, "progress_handler"):
-            try:
-                downloader.progress_handler.close()
-            except Exception as e:
-                logger.error(f"Error closing progress handler: {e}")
-
-    def _read_json_file(self, path: Path) -> dict:
-        """
-        Safely reads a JSON file and returns its content as a dict. Logs and returns empty dict on error.
-        Args:
-            path (Path): Path to the JSON file.
-        Returns:
-            dict: Parsed JSON content or empty dict if error.
-        """
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"Error reading JSON file {path}: {e}")
-            return {}
-
-    def _write_json_file(self, path: Path, data: dict) -> bool:
-        """
-        Safely writes a dict to a JSON file. Logs errors.
-        Args:
-            path (Path): Path to the JSON file.
-            data (dict): Data to write.
-        Returns:
-            bool: True if write succeeded, False otherwise.
-        """
-        try:
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
-            logger.info(f"JSON file written: {path}")
-            return True
-        except Exception as e:
-            logger.error(f"Error writing JSON file {path}: {e}")
-            return False
-
     def _get_query_sync(self, query: str) -> str:
         """
-        Retrieves the sync data for a given query from the sync file.
+        Retrieves the sync type under which a query is stored in the sync store.
         Args:
-            query (str): The Spotify query to look for in the sync file.
+            query (str): The Spotify query to look for in the sync store.
         Returns:
-            dict: The sync data for the query, or an empty dict if not found.
+            str: The sync type, e.g. "playlists", or the query itself.
         """
         if self._is_spotify_track(query):
             return "songs"
@@ -244,32 +320,19 @@ class SpotifyDownloader:
         else:
             return query
 
-    def _update_sync_file(self, query_dict: dict) -> None:
-        """
-        Update the sync file by removing any existing entry for the query and adding the new one,
-        but preserve all other sync types and queries.
-        Args:
-            query_dict (dict): The query dictionary to add/update in the sync file.
-        """
-        query = query_dict["query"]
-        sync_query = self._get_query_sync(query)
-        sync_path = Path(SYNC_JSON_PATH)
-        data = {}
-        if sync_path.exists():
-            data = self._read_json_file(sync_path)
-        # Get all queries for this sync type
-        all_queries = data.get(sync_query, [])
-        # Remove any existing entry for this query
-        all_queries = [q for q in all_queries if q.get("query") != query]
-        # Add the updated query
-        all_queries.append(query_dict)
-        # Update only the relevant sync type, preserve others
-        data[sync_query] = all_queries
-        self._write_json_file(sync_path, data)
+    def _update_sync_entry(self, query_dict: dict) -> None:
+        """
+        Adds or replaces the sync entry of a query in the sync store.
+        Only the rows of this entry are written.
+        Args:
+            query_dict (dict): The query dictionary to add/update in the sync store.
+        """
+        self.sync_store.upsert(self._get_query_sync(query_dict["query"]), query_dict)
 
     def _gen_m3u_files(self, songs: List[Song], query: str) -> None:
         """
-        Generate M3U files for the downloaded songs.
+        Generate M3U files for the downloaded songs. Only playlists whose content
+        changed are written.
         Args:
             songs (List[Song]): List of Song objects to generate M3U files for.
             query (str): The Spotify query string.
@@ -296,27 +359,13 @@ class SpotifyDownloader:
                 playlists[list_name] = songs
         else:
             return
-        for list_name, playlist_songs in playlists.items():
+        for list_name, playlist_songs in list(playlists.items()):
             if not list_name or not playlist_songs:
                 logger.warning(
                     f"Skipping M3U for empty playlist or list_name: {list_name}"
                 )
-                continue
-            m3u_content = create_m3u_content(
-                song_list=playlist_songs,
-                template="{artists} - {title}.{output-ext}",
-                file_extension=DOWNLOADER_OPTIONS["format"],
-                restrict=DOWNLOADER_OPTIONS["restrict"],
-                short=False,
-                detect_formats=DOWNLOADER_OPTIONS["detect_formats"],
-            )
-            file_path = Path(f"{DOWNLOAD_DIR}/Playlists/{list_name}/{list_name}.m3u8")
-            try:
-                with open(file_path, "w", encoding="utf-8") as m3u_file:
-                    m3u_file.write(m3u_content)
-                logger.info(f"M3U file generated: {file_path}")
-            except Exception as e:
-                logger.error(f"Error writing M3U file {file_path}: {e}")
+                del playlists[list_name]
+        self.m3u.write_all(playlists)
 
     @staticmethod
     def _get_largest_image(images: list) -> str | None:
@@ -331,33 +380,24 @@ class SpotifyDownloader:
             logger.warning(f"Error selecting largest image: {e}")
             return None
 
-    def _download_images(self, images_to_download: List[dict]) -> None:
+    def _download_images(self, images_to_download: List[dict]) -> List[Future]:
         """
-        Downloads images from the provided list of image URLs.
+        Starts downloading images in the background, so they are fetched while the
+        songs download.
         Args:
             images (list): List of dictionaries containing 'image_url' and 'list_name'.
+        Returns:
+            List[Future]: The pending image downloads.
         """
+        covers = []
         for item in images_to_download:
             list_name = item["list_name"]
             image_url = item["image_url"]
             if not image_url:
                 logger.warning(f"No image URL for {list_name}, skipping.")
                 continue
-            image_path = Path(f"{DOWNLOAD_DIR}/{list_name}/cover.jpg")
-            image_dir = image_path.parent
-            if not image_dir.exists():
-                image_dir.mkdir(parents=True, exist_ok=True)
-            if image_path.exists():
-                logger.info(f"Image already exists, skipping download: {image_path}")
-                continue
-            try:
-                response = requests.get(image_url, timeout=10)
-                response.raise_for_status()
-                with open(image_path, "wb") as f:
-                    f.write(response.content)
-                logger.info(f"Image saved: {image_path}")
-            except Exception as e:
-                logger.error(f"Error saving image for {list_name}: {e}")
+            covers.append((image_url, Path(f"{DOWNLOAD_DIR}/{list_name}/cover.jpg")))
+        return self.covers.fetch(covers)
 
     def __normalize_query_url(self, query: str) -> str:
         """
@@ -369,6 +409,52 @@ class SpotifyDownloader:
         """
         return re.sub(r"\/intl-\w+\/", "/", query)
 
+    def normalize_query(self, query: str) -> str:
+        """
+        Returns the canonical form of a query, used to detect duplicate requests.
+        Removes /intl-xxx/ segments and URL parameters such as ?si=.
+        Args:
+            query (str): The Spotify URL or query to normalize.
+        Returns:
+            str: The normalized query.
+        """
+        query = self.__normalize_query_url(query.strip())
+        if "open.spotify.com" in query:
+            query = query.split("?", 1)[0].rstrip("/")
+        return query
+
+    def _run_coalesced(self, command: str, query: str, run: Callable[[], Any]) -> Any:
+        """
+        Runs a download or sync unless the same one is already in flight.
+        Duplicate requests wait for the running one and return its result.
+        Args:
+            command (str): "download" or "sync".
+            query (str): The Spotify URL or query.
+            run (Callable): Function that performs the work.
+        Returns:
+            The result of the (possibly shared) run.
+        """
+        key = (command, self.normalize_query(query))
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+        if not owner:
+            logger.info(f"Attaching to in-flight {command} for '{key[1]}'")
+            return future.result()
+        try:
+            result = run()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
     def _populate_songs_from_lists(
         self, songs: List[Song], lists: List[SongList]
     ) -> List[Song]:
@@ -400,12 +486,12 @@ class SpotifyDownloader:
         Returns:
             bool: True if added successfully, False otherwise.
         """
-        song = Song.from_url(url=query)
+        song = load_song(query)
         if not song:
             logger.warning(f"Track not found for query: {query}")
             return False
         songs.append(song)
-        artist = Artist.from_url(song.artist_id, fetch_songs=False)
+        artist = ArtistProfile.from_url(song.artist_id)
         image_url = self._get_largest_image(artist.images)
         if image_url:
             images_to_download.append(
@@ -428,7 +514,9 @@ class SpotifyDownloader:
         Returns:
             bool: True if added successfully, False otherwise.
         """
-        playlist = Playlist.from_url(query, fetch_songs=False)
+        playlist = load_song_list(
+            Playlist, "playlist", query, version=self._get_playlist_snapshot(query)
+        )
         lists.append(playlist)
         images_to_download.append(
             {
@@ -450,10 +538,10 @@ class SpotifyDownloader:
         Returns:
             bool: True if added successfully, False otherwise.
         """
-        album = Album.from_url(query, fetch_songs=False)
+        album = load_song_list(Album, "album", query)
         lists.append(album)
         artist_id = album.artist["id"]
-        artist = Artist.from_url(artist_id, fetch_songs=False)
+        artist = ArtistProfile.from_url(artist_id)
         if not artist:
             logger.warning(f"Artist not found for album: {album.name}")
             return False
@@ -502,7 +590,7 @@ class SpotifyDownloader:
         Returns:
             bool: True if added successfully, False otherwise.
         """
-        user_playlists = get_all_user_playlists()
+        user_playlists = self._get_user_playlists()
         lists.extend(user_playlists)
         for playlist in user_playlists:
             images_to_download.append(
@@ -524,7 +612,7 @@ class SpotifyDownloader:
         Returns:
             bool: True if added successfully, False otherwise.
         """
-        saved_playlists = get_all_saved_playlists()
+        saved_playlists = self._get_user_playlists(saved=True)
         lists.extend(saved_playlists)
         for playlist in saved_playlists:
             images_to_download.append(
@@ -545,13 +633,15 @@ class SpotifyDownloader:
         Returns:
             bool: True if added successfully, False otherwise.
         """
-        saved_albums = get_user_saved_albums()
+        saved_albums = self._get_user_saved_albums()
         lists.extend(saved_albums)
+        seen_artists = set()
         for album in saved_albums:
             artist_id = album.artist["id"]
-            if not artist_id:
+            if not artist_id or artist_id in seen_artists:
                 continue
-            artist = Artist.from_url(artist_id, fetch_songs=False)
+            seen_artists.add(artist_id)
+            artist = ArtistProfile.from_url(artist_id)
             if not artist:
                 logger.warning(f"Artist not found for album: {album.name}")
                 continue
@@ -592,7 +682,7 @@ class SpotifyDownloader:
         """
         Handles saved tracks queries. Adds the saved tracks to lists.
         """
-        lists.append(Saved.from_url(query, fetch_songs=False))
+        lists.append(load_saved(query))
         return True
 
     def _get_dispatch_dict(
@@ -644,18 +734,126 @@ class SpotifyDownloader:
             "saved": (self._is_spotify_saved, lambda q: self._handle_saved(q, lists)),
         }
 
-    def _get_user_followed_artists() -> List[Artist]:
+    @staticmethod
+    def _get_all_items(spotify_client: SpotifyClient, response: dict) -> List[dict]:
         """
-        Get all user playlists
+        Returns the items of a paginated Spotify response and all its next pages.
+        """
+        items = list(response["items"])
+        while response and response["next"]:
+            response = spotify_client.next(response)
+            if response is None:
+                break
+            items.extend(response["items"])
+        return items
 
-        ### Returns
-        - List of all user playlists
+    def _get_user_saved_albums(self) -> List[Album]:
         """
-        spotify_client = SpotifyClient()
+        Returns the albums saved in the user library, reading through the metadata cache.
+        """
+        spotify_client = get_spotify_client()
         if spotify_client.user_auth is False:  # type: ignore
             raise SpotifyError("You must be logged in to use this function")
 
-        user_followed_response = spotify_client.current_user_followed_artists()
+        response = spotify_client.current_user_saved_albums()
+        if response is None:
+            raise SpotifyError("Couldn't get user saved albums")
+
+        return [
+            load_song_list(Album, "album", item["album"]["external_urls"]["spotify"])
+            for item in self._get_all_items(spotify_client, response)
+        ]
+
+    def _list_user_playlists(self, saved: bool = False) -> List[dict]:
+        """
+        Returns the raw metadata of the user playlists, without their tracks.
+        Args:
+            saved (bool): Include the playlists the user follows, not only their own.
+        Returns:
+            List[dict]: The playlists, with their URL and snapshot_id.
+        """
+        spotify_client = get_spotify_client()
+        if spotify_client.user_auth is False:  # type: ignore
+            raise SpotifyError("You must be logged in to use this function")
+
+        user_id = None
+        if saved:
+            response = spotify_client.current_user_playlists()
+        else:
+            user = spotify_client.current_user()
+            if user is None:
+                raise SpotifyError("Couldn't get user info")
+            user_id = user["id"]
+            response = spotify_client.user_playlists(user_id)
+        if response is None:
+            raise SpotifyError("Couldn't get user playlists")
+
+        return [
+            playlist
+            for playlist in self._get_all_items(spotify_client, response)
+            if playlist and (user_id is None or playlist["owner"]["id"] == user_id)
+        ]
+
+    def _get_user_playlists(self, saved: bool = False) -> List[Playlist]:
+        """
+        Returns the playlists of the user, reading through the metadata cache.
+        Cached playlists are reused while their snapshot_id is unchanged.
+        Args:
+            saved (bool): Include the playlists the user follows, not only their own.
+        Returns:
+            List[Playlist]: The playlists.
+        """
+        return [
+            load_song_list(
+                Playlist,
+                "playlist",
+                playlist["external_urls"]["spotify"],
+                version=playlist["snapshot_id"],
+            )
+            for playlist in self._list_user_playlists(saved)
+        ]
+
+    def _get_playlist_snapshot(self, query: str) -> str:
+        """
+        Returns the snapshot_id of a playlist, which changes on every edit.
+        """
+        response = get_spotify_client().playlist(query, fields="snapshot_id")
+        if response is None:
+            raise SpotifyError(f"Couldn't get snapshot of playlist {query}")
+        return response["snapshot_id"]
+
+    def _get_playlist_snapshots(self, query: str) -> Dict[str, str] | None:
+        """
+        Returns the snapshot_id of every playlist in a query, with one cheap call
+        per playlist or per page of user playlists.
+        Args:
+            query (str): The Spotify query or URL.
+        Returns:
+            Dict[str, str] | None: Snapshot by playlist id, or None if the query
+            has content that is not a playlist.
+        """
+        with spotify_calls:
+            if self._is_spotify_playlist(query):
+                return {spotify_id(query): self._get_playlist_snapshot(query)}
+            if self._is_spotify_user_playlists(query):
+                playlists = self._list_user_playlists()
+            elif self._is_spotify_saved_playlists(query):
+                playlists = self._list_user_playlists(saved=True)
+            else:
+                return None
+        return {playlist["id"]: playlist["snapshot_id"] for playlist in playlists}
+
+    def _list_user_followed_artists(self) -> List[dict]:
+        """
+        Returns the raw metadata of the artists the user follows, without their albums.
+        """
+        spotify_client = get_spotify_client()
+        if spotify_client.user_auth is False:  # type: ignore
+            raise SpotifyError("You must be logged in to use this function")
+
+        user_followed_response = spotify_client.current_user_followed_artists(
+            limit=50
+        )
         if user_followed_response is None:
             raise SpotifyError("Couldn't get user followed artists")
 
@@ -671,76 +869,283 @@ class SpotifyDownloader:
             user_followed_response = response["artists"]
             user_followed.extend(user_followed_response["items"])
 
-        return [
-            Artist.from_url(
-                followed_artist["external_urls"]["spotify"], fetch_songs=False
-            )
-            for followed_artist in user_followed
-        ]
+        return user_followed
+
+    def _iter_user_followed_artists(self) -> Iterator[Artist]:
+        """
+        Resolves the artists the user follows concurrently, reading through the
+        metadata cache, and yields each one as soon as it is resolved.
+        Artists that can't be resolved are logged and skipped.
+        """
+        followed = self._list_user_followed_artists()
+        logger.info(f"Resolving {len(followed)} followed artists")
+        with ThreadPoolExecutor(
+            max_workers=SPOTIFY_CONCURRENCY, thread_name_prefix="artist"
+        ) as executor:
+            futures = {
+                executor.submit(
+                    Artist.from_url,
+                    artist["external_urls"]["spotify"],
+                    fetch_songs=False,
+                ): artist
+                for artist in followed
+            }
+            for future in as_completed(futures):
+                try:
+                    yield future.result()
+                except Exception as e:
+                    logger.error(
+                        f"Error resolving artist {futures[future]['name']}: {e}"
+                    )
 
-    def _search_and_download(
-        self, downloader: Downloader, query: str, output: str
-    ) -> bool:
+    def _get_user_followed_artists(self) -> List[Artist]:
+        """
+        Returns all the artists the user follows, in the order they are resolved.
+        """
+        return list(self._iter_user_followed_artists())
+
+    def _resolve_query(
+        self, query: str
+    ) -> Tuple[List[Song], List[dict]] | None:
         """
-        Searches for Spotify content based on the query and downloads it using a modular dispatch dictionary.
+        Resolves a Spotify query into the songs to download and the cover images to save,
+        using a modular dispatch dictionary.
         Args:
-            downloader (Downloader): SpotDL Downloader instance.
-            query (str): Spotify URL or query to process.
-            output (str): Output path pattern for downloads.
+            query (str): Normalized Spotify URL or query.
         Returns:
-            bool: True if download succeeded, False otherwise.
+            Tuple[List[Song], List[dict]] | None: Songs and images, or None if nothing to download.
         """
         songs: List[Song] = []
         lists: List[SongList] = []
         images_to_download = []
 
-        logger.info(f"Processing query: {query}")
-        query = self.__normalize_query_url(query)
-
         dispatch = self._get_dispatch_dict(songs, lists, images_to_download)
 
         handled = False
-        try:
+        with spotify_calls:
             for key, (check_fn, handler_fn) in dispatch.items():
                 if check_fn(query):
                     handled = handler_fn(query)
                     break
             if not handled:
                 logger.warning(f"Unsupported query type for image saving: {query}")
-                return False
+                return None
 
             self._populate_songs_from_lists(songs, lists)
 
-            # Filter songs by album type if specified
-            original_length = len(songs)
-            album_type = DOWNLOADER_OPTIONS["album_type"]
-            if album_type:
-                songs = [song for song in songs if song.album_type == album_type]
-                logger.info(
-                    f"Skipped {(original_length - len(songs))} songs for Album Type {album_type}"
+        songs = self._filter_album_type(songs)
+
+        logger.debug(f"Found {len(songs)} songs in {len(lists)} lists")
+        if not songs:
+            logger.error("No songs to download.")
+            return None
+        return songs, images_to_download
+
+    def _filter_album_type(self, songs: List[Song]) -> List[Song]:
+        """
+        Filters songs by album type if specified.
+        """
+        original_length = len(songs)
+        album_type = DOWNLOADER_OPTIONS["album_type"]
+        if album_type:
+            songs = [song for song in songs if song.album_type == album_type]
+            logger.info(
+                f"Skipped {(original_length - len(songs))} songs for Album Type {album_type}"
+            )
+        return songs
+
+    def _download_user_followed_artists(
+        self, downloader: Downloader, job: Optional["Job"] = None
+    ) -> List[Song]:
+        """
+        Downloads the songs of every followed artist as soon as the artist is resolved,
+        instead of waiting for the whole list. Songs shared by several artists are
+        downloaded once.
+        No checkpoint is kept: after a restart artists are resolved again from the
+        metadata cache and files already downloaded are skipped by SpotDL.
+        Args:
+            downloader (Downloader): SpotDL Downloader instance.
+            job (Job | None): The job running this download, if any.
+        Returns:
+            List[Song]: All the songs of the followed artists.
+        """
+        all_songs: List[Song] = []
+        seen_urls = set()
+        image_futures: List[Future] = []
+        for artist in self._iter_user_followed_artists():
+            songs: List[Song] = []
+            self._populate_songs_from_lists(songs, [artist])
+            songs = [
+                song
+                for song in self._filter_album_type(songs)
+                if song.url not in seen_urls
+            ]
+            seen_urls.update(song.url for song in songs)
+            all_songs.extend(songs)
+
+            image_url = self._get_largest_image(artist.images)
+            if image_url:
+                image_futures += self._download_images(
+                    [{"list_name": artist.name, "image_url": image_url}]
                 )
+            self._download_songs(downloader, songs, job)
+        wait(image_futures)
+        return all_songs
 
-            logger.debug(f"Found {len(songs)} songs in {len(lists)} lists")
-            if not songs:
-                logger.error("No songs to download.")
-                return False
+    def _search_and_download(
+        self,
+        downloader: Downloader,
+        query: str,
+        output: str,
+        job: Optional["Job"] = None,
+    ) -> bool:
+        """
+        Searches for Spotify content based on the query and downloads it.
+        Progress is checkpointed, so an interrupted download resumes where it stopped
+        without resolving the query again.
+        Args:
+            downloader (Downloader): SpotDL Downloader instance.
+            query (str): Spotify URL or query to process.
+            output (str): Output path pattern for downloads.
+            job (Job | None): The job running this download, if any.
+        Returns:
+            bool: True if download succeeded, False otherwise.
+        """
+        logger.info(f"Processing query: {query}")
+        query = self.__normalize_query_url(query)
+        checkpoint = Checkpoint("download", self.normalize_query(query))
 
-            self._download_images(images_to_download)
-            downloader.download_multiple_songs(songs)
-            self._update_sync_file(
+        snapshots = None
+        try:
+            if self._is_spotify_user_followed_artists(query):
+                songs = self._download_user_followed_artists(downloader, job)
+                if not songs:
+                    logger.error("No songs to download.")
+                    return False
+            else:
+                if checkpoint.load():
+                    songs, images_to_download = checkpoint.songs, checkpoint.images
+                else:
+                    # Taken before resolving, so later edits are seen by the next sync
+                    snapshots = self._get_sync_snapshots(query)
+                    resolved = self._resolve_query(query)
+                    if resolved is None:
+                        return False
+                    songs, images_to_download = resolved
+                    checkpoint.save(songs, images_to_download)
+
+                if job:
+                    job.report_size(len(songs))
+
+                image_futures = self._download_images(images_to_download)
+                self._download_songs(
+                    downloader,
+                    checkpoint.pending(songs),
+                    job,
+                    checkpoint,
+                    self._progressive_m3u(songs, query, checkpoint),
+                )
+                wait(image_futures)
+                if checkpoint.pending(songs):
+                    # Unchanged playlists are skipped, so failed songs would never
+                    # be retried
+                    snapshots = None
+            self._update_sync_entry(
                 {
                     "type": "sync",
                     "query": query,
                     "songs": [song.json for song in songs],
                     "output": output,
+                    "snapshots": snapshots,
                 },
             )
             self._gen_m3u_files(songs=songs, query=query)
+            checkpoint.remove()
         except Exception as e:
             logger.error(f"Download error for query '{query}': {str(e)}")
             return False
         return True
 
+    def _download_songs(
+        self,
+        downloader: Downloader,
+        songs: List[Song],
+        job: Optional["Job"] = None,
+        checkpoint: Checkpoint | None = None,
+        on_progress: Callable[[], None] | None = None,
+    ) -> None:
+        """
+        Downloads the songs in batches. Between batches the running job may yield
+        to shorter jobs, and completed songs are recorded in the checkpoint.
+        Args:
+            downloader (Downloader): SpotDL Downloader instance.
+            songs (List[Song]): Songs to download.
+            job (Job | None): The job running this download, if any.
+            checkpoint (Checkpoint | None): Checkpoint to record progress in, if any.
+            on_progress (Callable | None): Called after every batch, if batched.
+        """
+        progress = getattr(downloader, "progress", None)
+        total = len(songs)
+        songs, repeated = self._skip_downloaded(downloader, songs, checkpoint)
+        if progress:
+            progress.add(total=total, done=total - len(songs) - len(repeated))
+        if job is None and checkpoint is None:
+            self.library.record(downloader.download_multiple_songs(songs))
+            self._link_repeated(downloader, repeated)
+            return
+        if on_progress:
+            # Songs already in the library are playable right away
+            on_progress()
+        for start in range(0, len(songs), SONG_BATCH_SIZE):
+            if job:
+                job.checkpoint()
+            batch = songs[start : start + SONG_BATCH_SIZE]
+            results = downloader.download_multiple_songs(batch)
+            self.library.record(results)
+            if checkpoint:
+                # Results keep the batch order; their songs may have lost the list
+                checkpoint.mark_done(
+                    song for song, (_, path) in zip(batch, results) if path
+                )
+            if on_progress:
+                on_progress()
+        self._link_repeated(downloader, repeated, checkpoint)
+
+    def _progressive_m3u(
+        self, songs: List[Song], query: str, checkpoint: Checkpoint
+    ) -> Callable[[], None] | None:
+        """
+        Returns a callback that refreshes the M3U files of a download in progress
+        with the songs completed so far, in playlist order, so a large playlist is
+        playable long before it finishes. The callback runs after every batch, but
+        refreshes at most every M3U_REFRESH_SECONDS.
+        Args:
+            songs (List[Song]): All the songs of the download, in order.
+            query (str): The Spotify query string.
+            checkpoint (Checkpoint): Checkpoint with the completed songs.
+        Returns:
+            Callable | None: The callback, or None if the query has no M3U files.
+        """
+        if not (
+            self._is_spotify_playlist(query)
+            or self._is_spotify_saved(query)
+            or self._is_spotify_user_playlists(query)
+            or self._is_spotify_saved_playlists(query)
+        ):
+            return None
+        last_refresh = 0.0
+
+        def refresh() -> None:
+            nonlocal last_refresh
+            if time.monotonic() - last_refresh < M3U_REFRESH_SECONDS:
+                return
+            last_refresh = time.monotonic()
+            done = [song for song in songs if checkpoint.is_done(song)]
+            if done:
+                self._gen_m3u_files(songs=done, query=query)
+
+        return refresh
+
     def _send_status_message(self, bot: telebot.TeleBot, text: str) -> int | None:
         """
         Sends a status message to the user and returns the message_id (or None if failed).
@@ -780,66 +1185,6 @@ class SpotifyDownloader:
         """
         return Path(create_file_name(song, output, fmt, restrict))
 
-    def _remove_file(self, file: Path) -> None:
-        """
-        Safely remove a file and its .lrc if configured.
-        """
-        if file.exists():
-            logger.info(f"Deleting {file}")
-            try:
-                file.unlink()
-            except (PermissionError, OSError) as exc:
-                logger.error(f"Could not remove file: {file}, error: {exc}")
-        else:
-            logger.info(f"{file} does not exist.")
-
-    def _remove_lrc(self, file: Path, remove_lrc: bool) -> None:
-        """
-        Remove the .lrc file associated with a song file if configured.
-        """
-        if remove_lrc:
-            lrc_file = file.with_suffix(".lrc")
-            if lrc_file.exists():
-                logger.info(f"Deleting lrc {lrc_file}")
-                try:
-                    lrc_file.unlink()
-                except (PermissionError, OSError) as exc:
-                    logger.error(f"Could not remove lrc file: {lrc_file}, error: {exc}")
-            else:
-                logger.info(f"{lrc_file} does not exist.")
-
-    def _rename_file(self, old_path: Path, new_path: Path) -> None:
-        """
-        Safely rename a file, removing the destination if it exists.
-        """
-        if old_path.exists():
-            logger.info(f"Renaming '{old_path}' to '{new_path}'")
-            if new_path.exists():
-                old_path.unlink()
-                return
-            try:
-                old_path.rename(new_path)
-            except (PermissionError, OSError) as exc:
-                logger.error(f"Could not rename file: {old_path}, error: {exc}")
-        else:
-            logger.info(f"{old_path} does not exist.")
-
-    def _rename_lrc(self, old_path: Path, new_path: Path, remove_lrc: bool) -> None:
-        """
-        Rename the .lrc file associated with a song file if configured.
-        """
-        if remove_lrc:
-            lrc_file = old_path.with_suffix(".lrc")
-            new_lrc_file = new_path.with_suffix(".lrc")
-            if lrc_file.exists():
-                logger.info(f"Renaming lrc '{lrc_file}' to '{new_lrc_file}'")
-                try:
-                    lrc_file.rename(new_lrc_file)
-                except (PermissionError, OSError) as exc:
-                    logger.error(f"Could not rename lrc file: {lrc_file}, error: {exc}")
-            else:
-                logger.info(f"{lrc_file} does not exist.")
-
     def _build_song_data(self, song: Song, song_list: SongList) -> dict:
         """
         Builds the metadata dictionary for a song according to its list and configuration.
@@ -874,29 +1219,48 @@ class SpotifyDownloader:
                 song_data["album_artist"] = song_list.author_name
         return song_data
 
-    def download(self, bot: telebot.TeleBot, query: str) -> bool:
+    def download(
+        self, bot: telebot.TeleBot, query: str, job: Optional["Job"] = None
+    ) -> bool:
         """
         Downloads the content for the given Spotify query.
         Sends messages to the user via the Telegram bot.
+        If the same query is already downloading, waits for it instead.
 
         Args:
             bot: The Telegram bot instance.
             query: The Spotify URL or query to download.
+            job: The job running this download, used for scheduling.
 
         Returns:
             bool: True if download succeeded, False otherwise.
         """
+        return self._run_coalesced(
+            "download", query, lambda: self._download(bot=bot, query=query, job=job)
+        )
+
+    def _download(
+        self, bot: telebot.TeleBot, query: str, job: Optional["Job"] = None
+    ) -> bool:
+        """
+        Performs the download for the given Spotify query. See download().
+        """
         message_id = self._send_status_message(bot, get_text("download_in_progress"))
+        progress = JobProgress(bot, message_id, get_text("download_in_progress"))
+        progress_board.register(progress)
         output_pattern = self._get_output_pattern(query=query)
-        downloader = None
+        output = f"{DOWNLOAD_DIR}/{output_pattern}"
         try:
-            downloader = self._create_downloader()
-            downloader.settings["output"] = f"{DOWNLOAD_DIR}/{output_pattern}"
-            logger.info(f"Output pattern set to: {downloader.settings['output']}")
-
-            success = self._search_and_download(
-                downloader=downloader, query=query, output=downloader.settings["output"]
-            )
+            logger.info(f"Output pattern set to: {output}")
+            with self.runtime.downloader(
+                output=output, progress=progress
+            ) as downloader:
+                success = self._search_and_download(
+                    downloader=downloader,
+                    query=query,
+                    output=output,
+                    job=job,
+                )
             if not success:
                 logger.error(f"Failed to download songs for query: {query}")
                 send_message(bot=bot, message=get_text("error_download_failed"))
@@ -909,105 +1273,369 @@ class SpotifyDownloader:
             send_message(bot=bot, message=get_text("error_download_failed"))
             return False
         finally:
-            self._close_downloader(downloader)
+            progress_board.unregister(progress)
             self._delete_status_message(bot, message_id)
 
-    def sync(self, bot: telebot.TeleBot, query: str) -> None:
+    def _sync_entry(
+        self,
+        query: dict,
+        job: Optional["Job"] = None,
+        progress: JobProgress | None = None,
+    ) -> None:
         """
-        Sync function.
-        Downloads new songs and removes those no longer present in the playlists/albums/etc.
+        Syncs a single entry of the sync store: applies the diff against the previous
+        state and downloads the missing songs. Progress is checkpointed.
+        Args:
+            query (dict): The sync entry, with "query", "songs" and "output".
+            job (Job | None): The job running this sync, if any.
+            progress (JobProgress | None): Progress of the sync, shown to the user.
+        """
+        checkpoint = Checkpoint("sync", query["query"])
+        resumed = checkpoint.load()
+        snapshots = None
+        if not resumed:
+            snapshots = self._get_sync_snapshots(query["query"])
+            if snapshots is not None and snapshots == query.get("snapshots"):
+                logger.info(f"Playlists unchanged, skipping sync of '{query['query']}'")
+                return
+
+        with self.runtime.downloader(
+            output=query["output"], progress=progress
+        ) as downloader:
+            if resumed:
+                # The diff was already applied before the interrupted download started
+                songs = checkpoint.songs
+            else:
+                songs = self._resolve_sync_entry(query, downloader)
+                checkpoint.save(songs)
+
+            self._download_songs(
+                downloader,
+                checkpoint.pending(songs),
+                job,
+                checkpoint,
+                self._progressive_m3u(songs, query["query"], checkpoint),
+            )
+            if checkpoint.pending(songs):
+                # Unchanged playlists are skipped, so failed songs would never be
+                # retried
+                snapshots = None
+            self._update_sync_entry(
+                {
+                    "type": "sync",
+                    "query": query["query"],
+                    "songs": [song.json for song in songs],
+                    "output": query["output"],
+                    "snapshots": snapshots,
+                },
+            )
+            self._gen_m3u_files(songs=songs, query=query["query"])
+            checkpoint.remove()
+
+    def _get_sync_snapshots(self, query: str) -> Dict[str, str] | None:
+        """
+        Returns the playlist snapshots of a query, or None if they can't be used
+        to detect changes. Errors are logged and the entry is fully synced.
+        """
+        try:
+            return self._get_playlist_snapshots(query)
+        except Exception as e:
+            logger.warning(f"Could not get playlist snapshots for '{query}': {e}")
+            return None
+
+    def _resolve_sync_entry(self, query: dict, downloader: Downloader) -> List[Song]:
+        """
+        Fetches the current songs of a sync entry and removes or renames the files
+        of songs that changed since the last sync.
+        Args:
+            query (dict): The sync entry, with "query", "songs" and "output".
+            downloader (Downloader): SpotDL Downloader instance with the entry settings.
+        Returns:
+            List[Song]: The current songs of the entry.
+        """
+        resolved = self._resolve_query(query["query"])
+        if resolved is None:
+            raise SpotifyError(f"Couldn't resolve sync entry '{query['query']}'")
+        songs, _ = resolved
+
+        if not downloader.settings.get("sync_without_deleting", False):
+            self._apply_sync_plan(
+                self._plan_sync_entry(query, songs, downloader),
+                downloader.settings.get("sync_remove_lrc", False),
+            )
+
+        return songs
+
+    @staticmethod
+    def _plan_sync_entry(
+        query: dict, songs: List[Song], downloader: Downloader
+    ) -> SyncPlan:
+        """
+        Computes the file changes of a sync entry with the settings of its downloader.
+        With "sync_without_deleting", no file is deleted or renamed.
+        Args:
+            query (dict): The sync entry, with "query", "songs" and "output".
+            songs (List[Song]): The current songs of the entry.
+            downloader (Downloader): SpotDL Downloader instance with the entry settings.
+        Returns:
+            SyncPlan: The plan.
+        """
+        plan = SyncDiff(
+            downloader.settings["output"],
+            downloader.settings["format"],
+            downloader.settings["restrict"],
+        ).plan(query["query"], query["songs"], songs)
+        if downloader.settings.get("sync_without_deleting", False):
+            plan.to_delete = []
+            plan.to_rename = []
+        return plan
+
+    def _apply_sync_plan(self, plan: SyncPlan, remove_lrc: bool) -> None:
+        """
+        Renames and deletes the files of a sync plan through the file journal.
+        Args:
+            plan (SyncPlan): The plan computed by SyncDiff.
+            remove_lrc (bool): Also rename or delete the .lrc files.
+        """
+        ops = []
+        for old_path, new_path in plan.to_rename:
+            ops.append(rename_op(old_path, new_path))
+            if remove_lrc:
+                ops.append(
+                    rename_op(old_path.with_suffix(".lrc"), new_path.with_suffix(".lrc"))
+                )
+
+        for file in plan.to_delete:
+            ops.append(delete_op(file))
+            if remove_lrc:
+                ops.append(delete_op(file.with_suffix(".lrc")))
+
+        failed = self.journal.apply(ops)
+        if failed:
+            logger.error(f"{failed} file operations failed for '{plan.query}'")
+
+        if len(plan.to_delete) == 0:
+            logger.info("Nothing to delete...")
+        else:
+            logger.info(f"{len(plan.to_delete)} old songs were deleted.")
+
+    def plan_sync(self, query: str) -> List[dict]:
+        """
+        Dry run of a sync: resolves the entries of a sync type and returns what the
+        sync would add, delete and rename, without touching the disk. Each plan is
+        built as the sync builds it, with the settings of the entry.
+        Args:
+            query (str): The sync type, e.g. "playlists".
+        Returns:
+            List[dict]: The summary of the plan of every entry.
+        """
+        entries = self.sync_store.get_entries(query)
+        plans: List[dict | None] = [None] * len(entries)
+        # Entries are planned concurrently, like the sync runs them
+        with ThreadPoolExecutor(
+            max_workers=SYNC_CONCURRENCY, thread_name_prefix="plan"
+        ) as executor:
+            futures = {
+                executor.submit(self._plan_entry, entry): index
+                for index, entry in enumerate(entries)
+            }
+            for future in as_completed(futures):
+                entry = entries[futures[future]]
+                try:
+                    plans[futures[future]] = future.result().summary()
+                except Exception as e:
+                    logger.error(f"Plan error for query '{entry['query']}': {e}")
+        return [plan for plan in plans if plan is not None]
+
+    def _plan_entry(self, query: dict) -> SyncPlan:
+        """
+        Computes what `_sync_entry` would change for a sync entry, taking the same
+        decisions: an interrupted sync only downloads its pending songs, and an
+        entry whose playlists are unchanged is skipped.
+        Args:
+            query (dict): The sync entry, with "query", "songs" and "output".
+        Returns:
+            SyncPlan: The plan.
+        """
+        checkpoint = Checkpoint("sync", query["query"])
+        if checkpoint.load():
+            # The diff was already applied before the interrupted download started
+            pending = checkpoint.pending(checkpoint.songs)
+            return SyncPlan(
+                query=query["query"],
+                to_add=pending,
+                unchanged=len(checkpoint.songs) - len(pending),
+            )
+        snapshots = self._get_sync_snapshots(query["query"])
+        if snapshots is not None and snapshots == query.get("snapshots"):
+            return SyncPlan(query=query["query"], unchanged=len(query["songs"]))
+        resolved = self._resolve_query(query["query"])
+        if resolved is None:
+            raise SpotifyError(f"Couldn't resolve sync entry '{query['query']}'")
+        with self.runtime.downloader(output=query["output"]) as downloader:
+            return self._plan_sync_entry(query, resolved[0], downloader)
+
+    def plan(
+        self, bot: telebot.TeleBot, query: str, job: Optional["Job"] = None
+    ) -> bool:
+        """
+        Sends the user what a sync of the given sync type would change.
 
         Args:
             bot (telebot.TeleBot): The Telegram bot instance. Must not be None.
+            query (str): The sync type, e.g. "playlists".
+            job (Job | None): The job running this plan, if any.
+
+        Returns:
+            bool: True if the plan was sent, False otherwise.
         """
-        message_id = self._send_status_message(bot, get_text("sync_in_progress"))
-        sync_json_path = Path(SYNC_JSON_PATH)
-        if not sync_json_path.exists():
-            logger.error(f"Sync file not found: {sync_json_path}")
+        if self.sync_store.is_empty():
+            logger.error(f"No sync entries in {self.sync_store.path}")
             send_message(bot=bot, message=get_text("error_sync_file_not_found"))
-            self._delete_status_message(bot, message_id)
-            return
-        sync_queries = self._read_json_file(sync_json_path)
-        if not sync_queries or query not in sync_queries:
-            logger.error(f"Invalid or empty sync file: {sync_json_path}")
+            return False
+        if not self.sync_store.get_entries(query):
+            logger.error(f"No sync entries for '{query}' in {self.sync_store.path}")
             send_message(bot=bot, message=get_text("error_sync_file_invalid"))
+            return False
+        message_id = self._send_status_message(bot, get_text("plan_in_progress"))
+        try:
+            plans = self.plan_sync(query)
+        finally:
             self._delete_status_message(bot, message_id)
-            return
-        for query in sync_queries.get(query, []):
-            downloader = self._create_downloader()
-            try:
-                downloader.settings["output"] = query["output"]
-                songs = parse_query(
-                    query=[query["query"]],
-                    threads=downloader.settings["threads"],
-                    use_ytm_data=downloader.settings["ytm_data"],
-                    playlist_numbering=downloader.settings["playlist_numbering"],
-                    album_type=downloader.settings["album_type"],
-                    playlist_retain_track_cover=downloader.settings[
-                        "playlist_retain_track_cover"
-                    ],
+
+        lines = [
+            get_text(
+                "plan_result",
+                query=query,
+                add=sum(plan["add"] for plan in plans),
+                delete=sum(plan["delete"] for plan in plans),
+                rename=sum(plan["rename"] for plan in plans),
+                unchanged=sum(plan["unchanged"] for plan in plans),
+            )
+        ]
+        changed = [
+            plan for plan in plans if plan["add"] or plan["delete"] or plan["rename"]
+        ]
+        if not changed:
+            lines.append(get_text("plan_no_changes"))
+        for plan in changed:
+            lines.append(
+                get_text(
+                    "plan_entry",
+                    query=plan["query"],
+                    add=plan["add"],
+                    delete=plan["delete"],
+                    rename=plan["rename"],
                 )
+            )
+        # Entry queries are URLs, which Markdown would mangle
+        for message in self._split_message(lines):
+            send_message(bot=bot, message=message, parse_mode=None)
+        return True
 
-                old_files = []
-                for entry in query["songs"]:
-                    file_name = self._get_song_file_path(
-                        Song.from_dict(entry),
-                        downloader.settings["output"],
-                        downloader.settings["format"],
-                        downloader.settings["restrict"],
+    @staticmethod
+    def _split_message(lines: List[str], limit: int = 4000) -> List[str]:
+        """
+        Joins lines into messages that fit in a Telegram message.
+        """
+        messages, current = [], ""
+        for line in lines:
+            if current and len(current) + len(line) + 1 > limit:
+                messages.append(current)
+                current = ""
+            current = f"{current}\n{line}" if current else line
+        if current:
+            messages.append(current)
+        return messages
+
+    def sync(
+        self,
+        bot: telebot.TeleBot,
+        query: str,
+        job: Optional["Job"] = None,
+        quiet: bool = False,
+    ) -> bool:
+        """
+        Sync function.
+        Downloads new songs and removes those no longer present in the playlists/albums/etc.
+        If the same sync is already running, waits for it instead.
+
+        Args:
+            bot (telebot.TeleBot): The Telegram bot instance. Must not be None.
+            job (Job | None): The job running this sync, used for scheduling.
+            quiet (bool): Only log, and message the user only about failures, e.g.
+                for scheduled syncs.
+
+        Returns:
+            bool: True if every entry was synced, False otherwise.
+        """
+        return self._run_coalesced(
+            "sync",
+            query,
+            lambda: self._sync(bot=bot, query=query, job=job, quiet=quiet),
+        )
+
+    def _sync(
+        self,
+        bot: telebot.TeleBot,
+        query: str,
+        job: Optional["Job"] = None,
+        quiet: bool = False,
+    ) -> bool:
+        """
+        Performs the sync for the given sync type. See sync().
+        """
+        message_id = None
+        if not quiet:
+            message_id = self._send_status_message(bot, get_text("sync_in_progress"))
+        if self.sync_store.is_empty():
+            logger.error(f"No sync entries in {self.sync_store.path}")
+            if not quiet:
+                send_message(bot=bot, message=get_text("error_sync_file_not_found"))
+            self._delete_status_message(bot, message_id)
+            return False
+        entries = self.sync_store.get_entries(query)
+        if not entries:
+            logger.error(f"No sync entries for '{query}' in {self.sync_store.path}")
+            if not quiet:
+                send_message(bot=bot, message=get_text("error_sync_file_invalid"))
+            self._delete_status_message(bot, message_id)
+            return False
+        progress = JobProgress(bot, message_id, get_text("sync_in_progress"))
+        progress_board.register(progress)
+        failed = 0
+        # Entries are resolved and downloaded concurrently; Spotify calls and song
+        # downloads are bounded by the global limits.
+        with ThreadPoolExecutor(
+            max_workers=SYNC_CONCURRENCY, thread_name_prefix="sync"
+        ) as executor:
+            futures = {
+                executor.submit(self._sync_entry, entry, job, progress): entry
+                for entry in entries
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    failed += 1
+                    logger.error(
+                        f"Sync error for query '{futures[future]['query']}': {str(e)}"
                     )
-                    old_files.append((file_name, entry["url"]))
-
-                new_urls = [song.url for song in songs]
-
-                if not downloader.settings.get("sync_without_deleting", False):
-                    to_rename: List[Tuple[Path, Path]] = []
-                    to_delete = []
-                    for path, url in old_files:
-                        if url not in new_urls:
-                            to_delete.append(path)
-                        else:
-                            new_song = songs[new_urls.index(url)]
-                            new_path = self._get_song_file_path(
-                                Song.from_dict(new_song.json),
-                                downloader.settings["output"],
-                                downloader.settings["format"],
-                                downloader.settings["restrict"],
-                            )
-                            if path != new_path:
-                                to_rename.append((path, new_path))
-
-                    for old_path, new_path in to_rename:
-                        self._rename_file(old_path, new_path)
-                        self._rename_lrc(
-                            old_path,
-                            new_path,
-                            downloader.settings.get("sync_remove_lrc", False),
-                        )
-
-                    for file in to_delete:
-                        self._remove_file(file)
-                        self._remove_lrc(
-                            file, downloader.settings.get("sync_remove_lrc", False)
-                        )
-
-                    if len(to_delete) == 0:
-                        logger.info("Nothing to delete...")
-                    else:
-                        logger.info(f"{len(to_delete)} old songs were deleted.")
-
-                downloader.download_multiple_songs(songs)
-                self._update_sync_file(
-                    {
-                        "type": "sync",
-                        "query": query["query"],
-                        "songs": [song.json for song in songs],
-                        "output": query["output"],
-                    },
-                )
-                self._gen_m3u_files(songs=songs, query=query["query"])
-            finally:
-                self._close_downloader(downloader)
 
+        logger.info(f"Metadata cache: {metadata_cache.stats()}")
+        logger.info(f"Spotify requests: {rate_limiter.stats()}")
+        progress_board.unregister(progress)
         self._delete_status_message(bot, message_id)
-        send_message(bot=bot, message=get_text("sync_finished"))
+        if not quiet:
+            send_message(bot=bot, message=get_text("sync_finished"))
+        elif failed:
+            send_message(
+                bot=bot,
+                message=get_text(
+                    "sync_failed_entries",
+                    query=query,
+                    failed=failed,
+                    total=len(entries),
+                ),
+            )
+        return not failed
@@ -2,15 +2,25 @@
 Artist module for retrieving artist data from Spotify.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, List, Set, Tuple
+from typing import Any, Dict, Iterator, List, Set, Tuple
 
 from spotdl.types.album import Album
 from spotdl.types.song import Song, SongList
 from spotdl.utils.formatter import slugify
 from spotdl.utils.spotify import SpotifyClient
 
-__all__ = ["Artist", "ArtistError"]
+from settings.settings import SPOTIFY_CONCURRENCY
+from spotifyDownloader.metadata_cache import metadata_cache, spotify_id
+from spotifyDownloader.ratelimit import get_spotify_client
+
+__all__ = ["Artist", "ArtistError", "ArtistProfile"]
+
+# Maximum page size of the artist albums endpoint
+ARTIST_ALBUMS_PAGE_SIZE = 50
+# Maximum number of ids accepted by the several albums endpoint
+ALBUMS_BATCH_SIZE = 20
 
 
 class ArtistError(Exception):
@@ -19,6 +29,39 @@ class ArtistError(Exception):
     """
 
 
+@dataclass(frozen=True)
+class ArtistProfile:
+    """
+    Name, genres and images of an artist, without its discography.
+    """
+
+    name: str
+    url: str
+    genres: List[str]
+    images: List[Dict[str, Any]]
+
+    @classmethod
+    def from_url(cls, url: str) -> "ArtistProfile":
+        """
+        Get the profile of an artist with a single API call.
+
+        ### Arguments
+        - url: The URL or id of the artist.
+
+        ### Returns
+        - The artist profile.
+        """
+
+        raw_artist_meta = _get_raw_artist(get_spotify_client(), url)
+
+        return cls(
+            name=raw_artist_meta["name"],
+            url=raw_artist_meta["external_urls"]["spotify"],
+            genres=raw_artist_meta["genres"],
+            images=raw_artist_meta["images"],
+        )
+
+
 @dataclass(frozen=True)
 class Artist(SongList):
     """
@@ -44,49 +87,13 @@ class Artist(SongList):
         """
 
         # query spotify for artist details
-        spotify_client = SpotifyClient()
+        spotify_client = get_spotify_client()
 
         # get artist info
-        raw_artist_meta = spotify_client.artist(url)
+        raw_artist_meta = _get_raw_artist(spotify_client, url)
 
-        if raw_artist_meta is None:
-            raise ArtistError(
-                "Couldn't get metadata, check if you have passed correct artist id"
-            )
-
-        artist_albums = spotify_client.artist_albums(url, album_type="album,single")
-        # check if there is response
-        if not artist_albums:
-            raise ArtistError(
-                "Couldn't get albums, check if you have passed correct artist id"
-            )
-
-        # get artist albums and remove duplicates
-        # duplicates can occur if the artist has the same album available in
-        # different countries
-        albums: List[str] = []
-        known_albums: Set[str] = set()
-        for album in artist_albums["items"]:
-            albums.append(album["external_urls"]["spotify"])
-            known_albums.add(slugify(album["name"]))
-
-        # Fetch all artist albums
-        while artist_albums and artist_albums["next"]:
-            artist_albums = spotify_client.next(artist_albums)
-            if artist_albums is None:
-                break
-
-            for album in artist_albums["items"]:
-                album_name = slugify(album["name"])
-
-                if album_name not in known_albums:
-                    albums.append(album["external_urls"]["spotify"])
-                    known_albums.add(album_name)
-
-        songs = []
-        for album in albums:
-            album_obj = Album.from_url(album, fetch_songs=False)
-            songs.extend(album_obj.songs)
+        albums = _get_artist_albums(spotify_client, url)
+        songs = _get_albums_songs(spotify_client, [album["id"] for album in albums])
 
         # Very aggressive deduplication
         songs_list = []
@@ -101,8 +108,239 @@ class Artist(SongList):
             "name": raw_artist_meta["name"],
             "genres": raw_artist_meta["genres"],
             "url": url,
-            "albums": albums,
+            "albums": [album["url"] for album in albums],
             "images": raw_artist_meta["images"],
         }
 
         return metadata, songs_list
+
+
+def _get_raw_artist(spotify_client: SpotifyClient, url: str) -> Dict[str, Any]:
+    """
+    Get the raw metadata of an artist, reading through the metadata cache.
+
+    ### Arguments
+    - spotify_client: The Spotify client.
+    - url: The URL or id of the artist.
+
+    ### Returns
+    - The raw metadata of the artist.
+    """
+
+    raw_artist_meta = metadata_cache.get_or_fetch(
+        "artist", spotify_id(url), lambda: spotify_client.artist(url)
+    )
+
+    if raw_artist_meta is None:
+        raise ArtistError(
+            "Couldn't get metadata, check if you have passed correct artist id"
+        )
+
+    return raw_artist_meta
+
+
+def _get_artist_albums(spotify_client: SpotifyClient, url: str) -> List[Dict[str, str]]:
+    """
+    Get the albums and singles of an artist, reading through the metadata cache.
+
+    ### Arguments
+    - spotify_client: The Spotify client.
+    - url: The URL or id of the artist.
+
+    ### Returns
+    - List of dicts with the id and URL of every album, without duplicates.
+    """
+
+    cached_albums = metadata_cache.get("artist_albums", spotify_id(url))
+    if cached_albums is not None:
+        return cached_albums
+
+    artist_albums = spotify_client.artist_albums(
+        url, album_type="album,single", limit=ARTIST_ALBUMS_PAGE_SIZE
+    )
+    # check if there is response
+    if not artist_albums:
+        raise ArtistError(
+            "Couldn't get albums, check if you have passed correct artist id"
+        )
+
+    # the total is known from the first page, so the rest are fetched concurrently
+    page_size = artist_albums["limit"]
+    offsets = range(page_size, artist_albums["total"], page_size)
+    with ThreadPoolExecutor(max_workers=SPOTIFY_CONCURRENCY) as executor:
+        pages = [artist_albums] + list(
+            executor.map(
+                lambda offset: spotify_client.artist_albums(
+                    url,
+                    album_type="album,single",
+                    limit=ARTIST_ALBUMS_PAGE_SIZE,
+                    offset=offset,
+                ),
+                offsets,
+            )
+        )
+
+    # get artist albums and remove duplicates
+    # duplicates can occur if the artist has the same album available in
+    # different countries
+    albums: List[Dict[str, str]] = []
+    known_albums: Set[str] = set()
+    for page in pages:
+        if page is None:
+            continue
+
+        for album in page["items"]:
+            album_name = slugify(album["name"])
+
+            if album_name not in known_albums:
+                albums.append(
+                    {"id": album["id"], "url": album["external_urls"]["spotify"]}
+                )
+                known_albums.add(album_name)
+
+    metadata_cache.set("artist_albums", spotify_id(url), albums)
+    return albums
+
+
+def _get_albums_songs(
+    spotify_client: SpotifyClient, album_ids: List[str]
+) -> List[Song]:
+    """
+    Get the songs of many albums, reading through the metadata cache.
+    Albums missing from the cache are fetched in batches.
+
+    ### Arguments
+    - spotify_client: The Spotify client.
+    - album_ids: The ids of the albums.
+
+    ### Returns
+    - List of songs of all the albums, in the order of `album_ids`.
+    """
+
+    album_songs: Dict[str, List[Dict[str, Any]]] = {}
+    for album_id in album_ids:
+        cached_songs = metadata_cache.get("album_tracks", album_id)
+        if cached_songs is not None:
+            album_songs[album_id] = cached_songs
+
+    missing_ids = [album_id for album_id in album_ids if album_id not in album_songs]
+    for raw_album_meta in _get_albums(spotify_client, missing_ids):
+        songs = [
+            song.json for song in _get_album_songs(spotify_client, raw_album_meta)
+        ]
+        album_songs[raw_album_meta["id"]] = songs
+        metadata_cache.set("album_tracks", raw_album_meta["id"], songs)
+
+    return [
+        Song.from_dict(song)
+        for album_id in album_ids
+        for song in album_songs.get(album_id, [])
+    ]
+
+
+def _get_albums(
+    spotify_client: SpotifyClient, album_ids: List[str]
+) -> Iterator[Dict[str, Any]]:
+    """
+    Get the full metadata of many albums, ALBUMS_BATCH_SIZE albums per request.
+
+    ### Arguments
+    - spotify_client: The Spotify client.
+    - album_ids: The ids of the albums.
+
+    ### Returns
+    - The raw metadata of every album, in the order of `album_ids`.
+    """
+
+    batches = [
+        album_ids[index : index + ALBUMS_BATCH_SIZE]
+        for index in range(0, len(album_ids), ALBUMS_BATCH_SIZE)
+    ]
+
+    with ThreadPoolExecutor(max_workers=SPOTIFY_CONCURRENCY) as executor:
+        responses = list(executor.map(spotify_client.albums, batches))
+
+    for response in responses:
+        if response is None:
+            raise ArtistError("Couldn't get metadata of the artist albums")
+
+        for raw_album_meta in response["albums"]:
+            if raw_album_meta:
+                yield raw_album_meta
+
+
+def _get_album_songs(
+    spotify_client: SpotifyClient, raw_album_meta: Dict[str, Any]
+) -> List[Song]:
+    """
+    Build the songs of an album from its raw metadata,
+    the same way as `Album.get_metadata` does.
+
+    ### Arguments
+    - spotify_client: The Spotify client.
+    - raw_album_meta: The raw metadata of the album, as returned by the albums endpoint.
+
+    ### Returns
+    - List of songs of the album.
+    """
+
+    # the first page of tracks comes with the album, fetch the rest if any
+    tracks_response = raw_album_meta["tracks"]
+    tracks = list(tracks_response["items"])
+    while tracks_response and tracks_response["next"]:
+        tracks_response = spotify_client.next(tracks_response)
+        if tracks_response is None:
+            break
+
+        tracks.extend(tracks_response["items"])
+
+    tracks = [
+        track
+        for track in tracks
+        if isinstance(track, dict) and not track.get("is_local")
+    ]
+    if not tracks:
+        return []
+
+    release_date = raw_album_meta["release_date"]
+    images = raw_album_meta["images"]
+    copyrights = raw_album_meta["copyrights"]
+
+    songs = []
+    for track in tracks:
+        artists = [artist["name"] for artist in track["artists"]]
+        songs.append(
+            Song.from_missing_data(
+                name=track["name"],
+                artists=artists,
+                artist=artists[0],
+                artist_id=track["artists"][0]["id"],
+                album_id=raw_album_meta["id"],
+                album_name=raw_album_meta["name"],
+                album_artist=raw_album_meta["artists"][0]["name"],
+                album_type=raw_album_meta["album_type"],
+                disc_number=track["disc_number"],
+                disc_count=int(tracks[-1]["disc_number"]),
+                duration=int(track["duration_ms"] / 1000),
+                year=release_date[:4],
+                date=release_date,
+                track_number=track["track_number"],
+                tracks_count=raw_album_meta["total_tracks"],
+                song_id=track["id"],
+                explicit=track["explicit"],
+                publisher=raw_album_meta["label"],
+                url=track["external_urls"]["spotify"],
+                cover_url=(
+                    max(
+                        images,
+                        key=lambda image: (image.get("width") or 0)
+                        * (image.get("height") or 0),
+                    )["url"]
+                    if images
+                    else None
+                ),
+                copyright_text=copyrights[0]["text"] if copyrights else None,
+            )
+        )
+
+    return songs
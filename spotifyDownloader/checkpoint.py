@@ -0,0 +1,149 @@
+"""
+Checkpoint module for resuming interrupted downloads and syncs.
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Set
+
+from loguru import logger
+from spotdl.types.song import Song
+
+from settings.settings import CACHE_DIR
+
+__all__ = ["Checkpoint", "CHECKPOINT_DIR"]
+
+CHECKPOINT_DIR = f"{CACHE_DIR}/checkpoints"
+
+# Checkpoints older than this are considered stale and resolved again
+CHECKPOINT_MAX_AGE = 7 * 24 * 3600
+
+
+def _song_key(song: Song) -> str:
+    """
+    Identifies a song within a job. The same song may appear in several lists of a
+    job, and every occurrence is saved to its own list, so the list is part of the key.
+    """
+    return f"{song.url}\t{song.list_url or ''}"
+
+
+class Checkpoint:
+    """
+    Resolved song list and per-song completion state of a download or sync entry.
+
+    The song list is written once, after the Spotify metadata has been resolved.
+    Completed songs are appended to a separate log after every batch, so progress
+    is saved incrementally and an interrupted job resumes at the first unfinished song.
+    """
+
+    def __init__(self, command: str, query: str, directory: str = CHECKPOINT_DIR):
+        self.command = command
+        self.query = query
+        key = hashlib.sha1(f"{command}|{query}".encode("utf-8")).hexdigest()
+        self.path = Path(directory) / f"{key}.json"
+        self.done_path = self.path.with_suffix(".done")
+        self.songs: List[Song] = []
+        self.images: List[Dict[str, Any]] = []
+        self.done: Set[str] = set()
+
+    def load(self) -> bool:
+        """
+        Loads a previous checkpoint for this query.
+        Returns:
+            bool: True if a valid checkpoint was found.
+        """
+        if not self.path.exists():
+            return False
+        if time.time() - self.path.stat().st_mtime > CHECKPOINT_MAX_AGE:
+            logger.info(f"Discarding stale checkpoint for '{self.query}'")
+            self.remove()
+            return False
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.songs = [Song.from_dict(song) for song in data["songs"]]
+            self.images = data.get("images", [])
+        except Exception as e:
+            logger.error(f"Error reading checkpoint {self.path}: {e}")
+            self.remove()
+            return False
+        self.done = set()
+        if self.done_path.exists():
+            with open(self.done_path, "r", encoding="utf-8") as f:
+                self.done = {line.rstrip("\n") for line in f if line.strip()}
+        logger.info(
+            f"Resuming '{self.query}' from checkpoint: "
+            f"{len(self.done)}/{len(self.songs)} songs already done"
+        )
+        return True
+
+    def save(self, songs: List[Song], images: List[Dict[str, Any]] = None) -> None:
+        """
+        Atomically stores the resolved song list and starts a new completion log.
+        Args:
+            songs (List[Song]): The resolved songs.
+            images (List[dict]): Pending cover images, if any.
+        """
+        self.songs = songs
+        self.images = images or []
+        self.done = set()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "command": self.command,
+                        "query": self.query,
+                        "songs": [song.json for song in songs],
+                        "images": self.images,
+                    },
+                    f,
+                    ensure_ascii=False,
+                )
+            self.done_path.unlink(missing_ok=True)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Error writing checkpoint {self.path}: {e}")
+
+    def mark_done(self, songs: Iterable[Song]) -> None:
+        """
+        Appends the given songs to the completion log.
+        """
+        keys = list(dict.fromkeys(_song_key(song) for song in songs))
+        keys = [key for key in keys if key not in self.done]
+        if not keys:
+            return
+        try:
+            with open(self.done_path, "a", encoding="utf-8") as f:
+                f.write("".join(f"{key}\n" for key in keys))
+                f.flush()
+                os.fsync(f.fileno())
+            self.done.update(keys)
+        except Exception as e:
+            logger.error(f"Error updating checkpoint {self.done_path}: {e}")
+
+    def pending(self, songs: List[Song]) -> List[Song]:
+        """
+        Returns the songs that have not been completed yet, keeping their order.
+        """
+        return [song for song in songs if not self.is_done(song)]
+
+    def is_done(self, song: Song) -> bool:
+        """
+        Returns True if the song has been completed in the list it belongs to.
+        """
+        return _song_key(song) in self.done
+
+    def remove(self) -> None:
+        """
+        Deletes the checkpoint once the job has finished.
+        """
+        for path in (self.path, self.done_path):
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning(f"Could not remove checkpoint {path}: {e}")
@@ -0,0 +1,114 @@
+"""
+Conversion module that runs ffmpeg conversion and metadata embedding on a process pool.
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import spotdl.download.downloader as spotdl_downloader
+from loguru import logger
+from spotdl.utils.ffmpeg import convert
+from spotdl.utils.metadata import embed_metadata
+
+from settings.settings import CONVERSION_WORKERS
+from spotifyDownloader.limits import release_song_download_slot
+
+__all__ = ["ConversionPool"]
+
+
+def _warm_up(delay: float) -> int:
+    time.sleep(delay)
+    return os.getpid()
+
+
+class ConversionPool:
+    """
+    Bounded process pool for the CPU-heavy post-processing of downloaded songs.
+
+    SpotDL converts and tags each song inside its download thread. Once the pool is
+    started, spotdl's convert() and embed_metadata() are routed to worker processes,
+    so at most one encode per core runs at a time and tagging happens outside the
+    bot process. The song's download slot is given back before converting, so
+    encoding is bounded by CONVERSION_WORKERS alone and other songs keep fetching
+    audio meanwhile, also when the pool is disabled and songs convert in-process.
+    """
+
+    def __init__(self, workers: int = CONVERSION_WORKERS):
+        self.workers = workers
+        self._executor: ProcessPoolExecutor | None = None
+        self._routed = False
+
+    def start(self) -> None:
+        """
+        Starts the worker processes and routes spotdl's post-processing to them.
+        Must be called before the job workers start.
+        """
+        if self._routed:
+            return
+        if self.workers >= 1 and "fork" in multiprocessing.get_all_start_methods():
+            # Fork every worker now, before the job threads exist. Spawned workers
+            # would re-import the bot entrypoint.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("fork"),
+            )
+            pids = set(self._executor.map(_warm_up, [0.2] * self.workers))
+            logger.info(f"Conversion pool started with {len(pids)} processes")
+        elif self.workers >= 1:
+            logger.warning("Conversion pool needs the fork start method, disabled")
+        spotdl_downloader.convert = self.convert
+        spotdl_downloader.embed_metadata = self.embed_metadata
+        self._routed = True
+
+    def convert(
+        self,
+        input_file,
+        output_file,
+        ffmpeg="ffmpeg",
+        output_format="mp3",
+        bitrate=None,
+        ffmpeg_args=None,
+        progress_handler=None,
+    ):
+        """
+        Drop-in replacement for spotdl's convert() that runs in a worker process.
+        The progress callback cannot cross the process boundary and is not used.
+        """
+        release_song_download_slot()
+        if self._executor is None:
+            return convert(
+                input_file,
+                output_file,
+                ffmpeg,
+                output_format,
+                bitrate,
+                ffmpeg_args,
+                progress_handler,
+            )
+        return self._executor.submit(
+            convert, input_file, output_file, ffmpeg, output_format, bitrate, ffmpeg_args
+        ).result()
+
+    def embed_metadata(self, *args, **kwargs):
+        """
+        Drop-in replacement for spotdl's embed_metadata() that runs in a worker process.
+        """
+        release_song_download_slot()
+        if self._executor is None:
+            return embed_metadata(*args, **kwargs)
+        return self._executor.submit(embed_metadata, *args, **kwargs).result()
+
+    def shutdown(self) -> None:
+        """
+        Restores in-process post-processing and stops the worker processes.
+        """
+        if not self._routed:
+            return
+        spotdl_downloader.convert = convert
+        spotdl_downloader.embed_metadata = embed_metadata
+        self._routed = False
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,297 @@
+"""
+Covers module for fetching artist and playlist images in the background.
+"""
+
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import requests
+from loguru import logger
+from requests.adapters import HTTPAdapter
+
+from settings.settings import CACHE_DIR, COVER_CONCURRENCY
+
+__all__ = ["CoverFetcher", "COVERS_DB_PATH", "COVERS_DIR"]
+
+COVERS_DB_PATH = f"{CACHE_DIR}/covers.sqlite"
+
+# Content-addressed store of the images, one file per SHA-256
+COVERS_DIR = f"{CACHE_DIR}/covers"
+
+# Seconds before a cached image is revalidated with a conditional GET
+COVER_REVALIDATE_AFTER = 7 * 24 * 3600
+
+# Bytes written to disk at a time while streaming an image
+CHUNK_SIZE = 64 * 1024
+
+REQUEST_TIMEOUT = 10
+
+# Locks that serialize the downloads of the same image URL, shared by hash
+URL_LOCK_STRIPES = 64
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS images (
+    url TEXT PRIMARY KEY,
+    hash TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    validated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS covers (
+    path TEXT PRIMARY KEY,
+    hash TEXT NOT NULL
+);
+"""
+
+
+class CoverFetcher:
+    """
+    Downloads cover images on a bounded thread pool with a shared keep-alive session.
+
+    Every image is stored once under COVERS_DIR, named by the SHA-256 of its
+    content, and the index maps image URLs to hashes and library covers to the
+    hash they were materialized from. A cover whose URL maps to the hash it
+    already has is answered from the index alone, without touching the network
+    or the library. Otherwise the cover is hardlinked (or copied) from the store,
+    so the same artist image shared by several folders is downloaded once.
+
+    Covers already in the library when they are first seen are adopted into the
+    store as they are, instead of being downloaded again. Images are streamed to a
+    temporary file and moved into place. Cached images are revalidated with a
+    conditional GET, using their ETag and Last-Modified, after
+    COVER_REVALIDATE_AFTER. Fetches are returned as futures, so callers can
+    download audio while the covers are fetched.
+    """
+
+    def __init__(
+        self,
+        path: str = COVERS_DB_PATH,
+        directory: str = COVERS_DIR,
+        workers: int = COVER_CONCURRENCY,
+    ) -> None:
+        self.path = path
+        self.directory = Path(directory)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="covers"
+        )
+        self._lock = threading.Lock()
+        self._url_locks = [threading.Lock() for _ in range(URL_LOCK_STRIPES)]
+        self._conn: sqlite3.Connection | None = None
+        self._inflight: Dict[str, Future] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Opens the database on first use.
+        Must be called with the fetcher lock held.
+        """
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            columns = [
+                row[1] for row in self._conn.execute("PRAGMA table_info(covers)")
+            ]
+            # Covers were indexed by path with their validators before the store
+            if "url" in columns:
+                self._conn.execute("DROP TABLE covers")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.directory / digest[:2] / f"{digest}.jpg"
+
+    def fetch(self, covers: List[Tuple[str, Path]]) -> List[Future]:
+        """
+        Starts fetching covers in the background. A cover already being fetched
+        is not fetched twice.
+        Args:
+            covers (List[Tuple[str, Path]]): Image URL and destination path pairs.
+        Returns:
+            List[Future]: One future per cover, resolving to True if it was saved
+                or is up to date.
+        """
+        futures = []
+        with self._lock:
+            for url, path in covers:
+                key = str(path)
+                future = self._inflight.get(key)
+                if future is None:
+                    future = self._executor.submit(self._fetch, url, Path(path))
+                    self._inflight[key] = future
+                    future.add_done_callback(
+                        lambda _, key=key: self._done(key)
+                    )
+                futures.append(future)
+        return futures
+
+    def _done(self, key: str) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def _fetch(self, url: str, path: Path) -> bool:
+        """
+        Makes sure the cover at `path` is the image at `url`.
+        """
+        with self._lock:
+            conn = self._connect()
+            image = conn.execute(
+                "SELECT hash, validated_at FROM images WHERE url = ?", (url,)
+            ).fetchone()
+            cover = conn.execute(
+                "SELECT hash FROM covers WHERE path = ?", (str(path),)
+            ).fetchone()
+        if (
+            image
+            and cover
+            and cover[0] == image[0]
+            and time.time() - image[1] < COVER_REVALIDATE_AFTER
+        ):
+            logger.debug(f"Image already up to date: {path}")
+            return True
+        if cover is None and path.exists():
+            return self._adopt(url, path)
+
+        digest = self._get_image(url)
+        if digest is None:
+            return False
+        if cover and cover[0] == digest and path.exists():
+            return True
+        try:
+            self._materialize(self._blob_path(digest), path)
+        except OSError as e:
+            logger.error(f"Error saving image {path}: {e}")
+            return False
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO covers VALUES (?, ?)", (str(path), digest)
+                )
+        logger.info(f"Image saved: {path}")
+        return True
+
+    def _get_image(self, url: str) -> str | None:
+        """
+        Returns the hash of the image at `url`, downloading it into the store if it
+        is not cached or changed since it was cached. Concurrent calls for the same
+        URL download it once.
+        """
+        with self._url_locks[hash(url) % URL_LOCK_STRIPES]:
+            with self._lock:
+                image = (
+                    self._connect()
+                    .execute(
+                        "SELECT hash, etag, last_modified, validated_at FROM images "
+                        "WHERE url = ?",
+                        (url,),
+                    )
+                    .fetchone()
+                )
+            headers = {}
+            if image and self._blob_path(image[0]).exists():
+                if time.time() - image[3] < COVER_REVALIDATE_AFTER:
+                    return image[0]
+                if image[1]:
+                    headers["If-None-Match"] = image[1]
+                if image[2]:
+                    headers["If-Modified-Since"] = image[2]
+
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.directory / f".{threading.get_ident()}.part"
+            try:
+                with self.session.get(
+                    url, headers=headers, stream=True, timeout=REQUEST_TIMEOUT
+                ) as response:
+                    if response.status_code == 304:
+                        digest = image[0]
+                    else:
+                        response.raise_for_status()
+                        sha256 = hashlib.sha256()
+                        with open(tmp_path, "wb") as f:
+                            for chunk in response.iter_content(CHUNK_SIZE):
+                                sha256.update(chunk)
+                                f.write(chunk)
+                        digest = sha256.hexdigest()
+                        blob_path = self._blob_path(digest)
+                        blob_path.parent.mkdir(parents=True, exist_ok=True)
+                        os.replace(tmp_path, blob_path)
+                    etag = response.headers.get("ETag") or (image and image[1])
+                    last_modified = response.headers.get("Last-Modified") or (
+                        image and image[2]
+                    )
+            except Exception as e:
+                logger.error(f"Error downloading image {url}: {e}")
+                tmp_path.unlink(missing_ok=True)
+                return None
+
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO images VALUES (?, ?, ?, ?, ?)",
+                        (url, digest, etag or None, last_modified or None, time.time()),
+                    )
+            return digest
+
+    def _adopt(self, url: str, path: Path) -> bool:
+        """
+        Indexes a cover saved before the index existed as the image at `url`, so it
+        is kept instead of downloaded again. It is revalidated like any cached image.
+        """
+        sha256 = hashlib.sha256()
+        try:
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                    sha256.update(chunk)
+            digest = sha256.hexdigest()
+            blob_path = self._blob_path(digest)
+            if not blob_path.exists():
+                self._materialize(path, blob_path)
+        except OSError as e:
+            logger.error(f"Error indexing image {path}: {e}")
+            return False
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR IGNORE INTO images VALUES (?, ?, NULL, NULL, ?)",
+                    (url, digest, time.time()),
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO covers VALUES (?, ?)", (str(path), digest)
+                )
+        logger.debug(f"Existing image indexed: {path}")
+        return True
+
+    @staticmethod
+    def _materialize(blob_path: Path, path: Path) -> None:
+        """
+        Places an image of the store at `path` as a hardlink, or as a copy when the
+        library is on another filesystem.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.part")
+        tmp_path.unlink(missing_ok=True)
+        try:
+            os.link(blob_path, tmp_path)
+        except OSError:
+            shutil.copyfile(blob_path, tmp_path)
+        os.replace(tmp_path, path)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        self.session.close()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
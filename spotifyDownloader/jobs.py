@@ -0,0 +1,412 @@
+"""
+Jobs module for running SpotifyDownloader downloads and syncs in background workers.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import telebot
+from loguru import logger
+
+from settings.settings import CACHE_DIR, DOWNLOAD_WORKERS
+from spotifyDownloader import SpotifyDownloader
+from spotifyDownloader.scheduler import BULK, JOB_CLASSES, Scheduler
+
+__all__ = ["Job", "JobQueue", "JOBS_JSON_PATH"]
+
+JOBS_JSON_PATH = f"{CACHE_DIR}/jobs.json"
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+class _Requeue(BaseException):
+    """
+    Unwinds a job run inline that turned out to be bulk, so it is handed back to the
+    queue. Derives from BaseException so the downloader's error handling lets it
+    through.
+    """
+
+
+@dataclass
+class Job:
+    """
+    A download or sync request.
+    Only the persistent fields are written to the jobs file.
+    """
+
+    command: str
+    query: str
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = JOB_QUEUED
+    created_at: float = field(default_factory=time.time)
+    job_class: str = ""
+    quiet: bool = False
+    key: Tuple[str, str] | None = field(default=None, repr=False, compare=False)
+    result: Any = field(default=None, repr=False, compare=False)
+    started_at: float | None = field(default=None, repr=False, compare=False)
+    finished_at: float | None = field(default=None, repr=False, compare=False)
+    _queue: Optional["JobQueue"] = field(default=None, repr=False, compare=False)
+    _inline: bool = field(default=False, repr=False, compare=False)
+    _done: threading.Event = field(
+        default_factory=threading.Event, repr=False, compare=False
+    )
+
+    @property
+    def finished(self) -> bool:
+        """
+        True once the job has run, successfully or not.
+        """
+        return self._done.is_set()
+
+    def wait(self, timeout: float | None = None) -> Any:
+        """
+        Blocks until the job has finished and returns its result.
+        Returns None if the timeout expires first.
+        """
+        self._done.wait(timeout)
+        return self.result
+
+    def report_size(self, song_count: int) -> None:
+        """
+        Called by the downloader once the number of songs is known, to reclassify the job.
+        """
+        if self._queue:
+            self._queue._reclassify(self, song_count)
+
+    def checkpoint(self) -> None:
+        """
+        Called by the downloader between song batches.
+        Bulk jobs run a waiting interactive job here before continuing. A job run
+        inline that turned out to be bulk is handed back to the queue instead, so
+        it does not stall the job it runs in.
+        """
+        if not self._queue:
+            return
+        if self._inline:
+            if self.job_class == BULK.name:
+                raise _Requeue()
+            return
+        self._queue._yield(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the persistent representation of the job.
+        """
+        return {
+            "id": self.id,
+            "command": self.command,
+            "query": self.query,
+            "status": self.status,
+            "created_at": self.created_at,
+            "job_class": self.job_class,
+            "quiet": self.quiet,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Job":
+        """
+        Builds a job from its persistent representation.
+        Jobs that were running when the bot stopped are queued again.
+        """
+        return cls(
+            command=data["command"],
+            query=data["query"],
+            id=data.get("id") or uuid.uuid4().hex,
+            status=JOB_QUEUED,
+            created_at=data.get("created_at") or time.time(),
+            job_class=data.get("job_class", ""),
+            quiet=data.get("quiet", False),
+        )
+
+
+class JobQueue:
+    """
+    Persistent queue of download and sync jobs processed by a pool of worker threads.
+    Telegram handlers only submit jobs, so polling is never blocked by a long download.
+    Pending and running jobs are stored in CACHE_DIR and restored on startup.
+    The order in which jobs run is decided by the Scheduler.
+    """
+
+    def __init__(
+        self,
+        downloader: SpotifyDownloader,
+        workers: int = DOWNLOAD_WORKERS,
+        path: str = JOBS_JSON_PATH,
+    ) -> None:
+        self.downloader = downloader
+        self.workers = workers
+        self.path = Path(path)
+        self.scheduler = Scheduler(workers=workers)
+        self.bot: telebot.TeleBot | None = None
+        self._pending: List[Job] = []
+        self._running: Dict[str, Job] = {}
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._stopping = False
+
+    def start(self, bot: telebot.TeleBot) -> None:
+        """
+        Restores persisted jobs and starts the worker threads.
+        Args:
+            bot (telebot.TeleBot): The Telegram bot used to report job status.
+        """
+        with self._cond:
+            if self._threads:
+                return
+            self.bot = bot
+            self.downloader.start()
+            self._stopping = False
+            known = {job.id for job in self._pending}
+            restored = [job for job in self._load() if job.id not in known]
+            for job in restored:
+                self._prepare(job)
+            if restored:
+                logger.info(f"Restored {len(restored)} pending jobs from {self.path}")
+            self._pending = restored + self._pending
+            for index in range(self.workers):
+                thread = threading.Thread(
+                    target=self._worker, name=f"job-worker-{index + 1}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+            self._cond.notify_all()
+        logger.info(f"Job queue started with {self.workers} workers")
+
+    def stop(self, timeout: float | None = None) -> None:
+        """
+        Stops the workers once their current job finishes.
+        Pending jobs stay in the jobs file and are resumed on the next start.
+        """
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(
+        self, command: str, query: str, quiet: bool = False
+    ) -> Tuple[Job, bool]:
+        """
+        Adds a new job to the queue.
+        If an equivalent job is already queued or running, no new job is created
+        and the existing one is returned instead, so its result is shared.
+        Args:
+            command (str): "download", "sync" or "plan".
+            query (str): The Spotify URL or query.
+            quiet (bool): Only report failures to the user, e.g. for scheduled jobs.
+        Returns:
+            Tuple[Job, bool]: The job, and True if it was newly queued.
+        """
+        job = Job(command=command, query=query, quiet=quiet)
+        self._prepare(job)
+        with self._cond:
+            existing = self._find(job.key)
+            if existing:
+                logger.info(
+                    f"Job {existing.id} already {existing.status} for {command} '{query}'"
+                )
+                return existing, False
+            self._pending.append(job)
+            self._persist()
+            self._cond.notify_all()
+        logger.info(f"Job {job.id} queued ({job.job_class}): {command} '{query}'")
+        return job, True
+
+    def pending_count(self) -> int:
+        """
+        Returns the number of jobs waiting for a worker.
+        """
+        with self._cond:
+            return len(self._pending)
+
+    def _prepare(self, job: Job) -> None:
+        """
+        Attaches runtime state to a new or restored job.
+        """
+        job.key = (job.command, self.downloader.normalize_query(job.query))
+        if job.job_class not in JOB_CLASSES:
+            job.job_class = self.scheduler.classify(job.command, job.query)
+        job._queue = self
+
+    def _find(self, key: Tuple[str, str]) -> Optional[Job]:
+        """
+        Returns the queued or running job with the given key, if any.
+        Must be called with the queue lock held.
+        """
+        for job in list(self._running.values()) + self._pending:
+            if job.key == key:
+                return job
+        return None
+
+    def _claim(self, job: Job) -> None:
+        """
+        Moves a pending job to the running set.
+        Must be called with the queue lock held.
+        """
+        self._pending.remove(job)
+        job.status = JOB_RUNNING
+        job.started_at = time.time()
+        self._running[job.id] = job
+        self.scheduler.record_start(job)
+        self._persist()
+
+    def _next_job(self) -> Optional[Job]:
+        """
+        Blocks until the scheduler selects a job and marks it as running.
+        Returns None when the queue is stopping.
+        """
+        with self._cond:
+            while True:
+                if self._stopping:
+                    return None
+                job = self.scheduler.select(self._pending, self._running.values())
+                if job:
+                    self._claim(job)
+                    return job
+                self._cond.wait()
+
+    def _reclassify(self, job: Job, song_count: int) -> None:
+        with self._cond:
+            job_class = self.scheduler.classify(job.command, job.query, song_count)
+            if job_class != job.job_class:
+                logger.info(
+                    f"Job {job.id} has {song_count} songs, rescheduled as {job_class}"
+                )
+                job.job_class = job_class
+                self._persist()
+                self._cond.notify_all()
+
+    def _yield(self, job: Job) -> None:
+        """
+        Runs a waiting interactive job in the thread of a bulk job, between two song batches.
+        At most one job is run per batch, so the bulk job keeps making progress.
+        """
+        with self._cond:
+            if self._stopping:
+                return
+            other = self.scheduler.preempting_job(job, self._pending)
+            if other is None:
+                return
+            self._claim(other)
+        logger.info(f"Job {job.id} yields to job {other.id}")
+        other._inline = True
+        self._run(other)
+
+    def _requeue(self, job: Job) -> None:
+        """
+        Hands a job that was run inline back to the queue, to be resumed from its
+        checkpoint by a worker.
+        """
+        with self._cond:
+            self._running.pop(job.id, None)
+            job._inline = False
+            job.status = JOB_QUEUED
+            job.started_at = None
+            self._pending.append(job)
+            self._persist()
+            self._cond.notify_all()
+        logger.info(f"Job {job.id} turned out to be {job.job_class}, requeued")
+
+    def _worker(self) -> None:
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            self._run(job)
+
+    def _run(self, job: Job) -> None:
+        """
+        Executes a job with the shared SpotifyDownloader.
+        """
+        logger.info(f"Job {job.id} started: {job.command} '{job.query}'")
+        start = time.monotonic()
+        success = False
+        requeued = False
+        try:
+            if job.command == "download":
+                success = self.downloader.download(
+                    bot=self.bot, query=job.query, job=job
+                )
+            elif job.command == "sync":
+                success = self.downloader.sync(
+                    bot=self.bot, query=job.query, job=job, quiet=job.quiet
+                )
+            elif job.command == "plan":
+                success = self.downloader.plan(bot=self.bot, query=job.query, job=job)
+            else:
+                logger.error(f"Unknown job command: {job.command}")
+        except _Requeue:
+            requeued = True
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {e}")
+        finally:
+            if requeued:
+                self._requeue(job)
+            else:
+                self._finish(job, success, time.monotonic() - start)
+
+    def _finish(self, job: Job, success: bool, duration: float) -> None:
+        """
+        Records the result of a job and wakes up anyone waiting for it.
+        """
+        with self._cond:
+            self._running.pop(job.id, None)
+            job.status = JOB_DONE if success else JOB_FAILED
+            job.result = success
+            job.finished_at = time.time()
+            self._persist()
+            self._cond.notify_all()
+        job._done.set()
+        logger.info(f"Job {job.id} {job.status} in {duration:.1f}s")
+
+    def _load(self) -> List[Job]:
+        """
+        Reads the persisted jobs. Running jobs are restored first, as they were started earlier.
+        """
+        if not self.path.exists():
+            return []
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.error(f"Error reading jobs file {self.path}: {e}")
+            return []
+        entries = sorted(
+            data.get("jobs", []), key=lambda entry: entry.get("status") != JOB_RUNNING
+        )
+        jobs = []
+        for entry in entries:
+            try:
+                jobs.append(Job.from_dict(entry))
+            except (KeyError, TypeError) as e:
+                logger.warning(f"Skipping invalid job entry {entry}: {e}")
+        return jobs
+
+    def _persist(self) -> None:
+        """
+        Atomically writes running and pending jobs to the jobs file.
+        Must be called with the queue lock held.
+        """
+        jobs = list(self._running.values()) + self._pending
+        tmp_path = self.path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"jobs": [job.to_dict() for job in jobs]},
+                    f,
+                    indent=4,
+                    ensure_ascii=False,
+                )
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Error writing jobs file {self.path}: {e}")
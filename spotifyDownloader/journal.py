@@ -0,0 +1,225 @@
+"""
+Journal module for applying the file operations of a sync safely and in parallel.
+"""
+
+import json
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Set
+
+from loguru import logger
+
+from settings.settings import CACHE_DIR, DOWNLOAD_DIR, FILE_OPS_CONCURRENCY
+
+__all__ = ["FileJournal", "JOURNAL_DIR", "rename_op", "delete_op"]
+
+JOURNAL_DIR = f"{CACHE_DIR}/journal"
+
+
+def rename_op(src: Path, dst: Path) -> Dict[str, Any]:
+    return {"op": "rename", "src": str(src), "dst": str(dst)}
+
+
+def delete_op(path: Path) -> Dict[str, Any]:
+    return {"op": "delete", "path": str(path)}
+
+
+def _op_paths(op: Dict[str, Any]) -> List[str]:
+    if op["op"] == "rename":
+        return [op["src"], op["dst"]]
+    return [op["path"]]
+
+
+def _rename(src: Path, dst: Path) -> None:
+    """
+    Renames a file, removing the source instead if the destination already exists.
+    A missing source means the rename was already applied.
+    """
+    if not src.exists():
+        logger.info(f"{src} does not exist.")
+        return
+    logger.info(f"Renaming '{src}' to '{dst}'")
+    if dst.exists():
+        src.unlink()
+        return
+    src.rename(dst)
+
+
+def _delete(path: Path) -> None:
+    """
+    Deletes a file. A missing file means the delete was already applied.
+    """
+    if not path.exists():
+        logger.info(f"{path} does not exist.")
+        return
+    logger.info(f"Deleting {path}")
+    path.unlink()
+
+
+class FileJournal:
+    """
+    Write-ahead journal of the renames and deletes of a sync.
+
+    The operations are written to a journal file before any of them is applied, and
+    each completed operation is appended to a log next to it. Operations are
+    idempotent, so a journal left behind by a crash is rolled forward on startup
+    and the files end up as the sync intended.
+
+    Operations that touch different paths run in parallel, bounded for network
+    filesystems; operations sharing a path keep their order. Directories emptied by
+    a batch are pruned once it completes.
+    """
+
+    def __init__(
+        self,
+        directory: str = JOURNAL_DIR,
+        root: str = DOWNLOAD_DIR,
+        workers: int = FILE_OPS_CONCURRENCY,
+    ) -> None:
+        self.directory = Path(directory)
+        self.root = Path(root)
+        self.workers = workers
+
+    def apply(self, ops: List[Dict[str, Any]]) -> int:
+        """
+        Journals and applies a batch of file operations.
+        Args:
+            ops (List[dict]): Operations built with `rename_op` and `delete_op`.
+        Returns:
+            int: The number of operations that failed.
+        """
+        if not ops:
+            return 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{uuid.uuid4().hex}.json"
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"ops": ops}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        return self._run(path, ops, set())
+
+    def replay(self) -> int:
+        """
+        Completes the journals left by an interrupted sync.
+        Returns:
+            int: The number of journals replayed.
+        """
+        if not self.directory.exists():
+            return 0
+        for tmp_path in self.directory.glob("*.tmp"):
+            # Never renamed into place, so none of its operations were applied
+            tmp_path.unlink(missing_ok=True)
+        journals = sorted(self.directory.glob("*.json"), key=os.path.getmtime)
+        for path in journals:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    ops = json.load(f)["ops"]
+            except Exception as e:
+                logger.error(f"Discarding unreadable journal {path}: {e}")
+                self._remove(path)
+                continue
+            done = self._load_done(path)
+            logger.info(
+                f"Replaying journal {path.name}: {len(ops) - len(done)} of "
+                f"{len(ops)} operations pending"
+            )
+            self._run(path, ops, done)
+        return len(journals)
+
+    def _run(self, path: Path, ops: List[Dict[str, Any]], done: Set[int]) -> int:
+        """
+        Applies the pending operations of a journal, prunes the emptied directories
+        and removes the journal.
+        """
+        done_path = path.with_suffix(".done")
+        done_lock = threading.Lock()
+        failed = 0
+
+        def run_group(indexes: List[int]) -> int:
+            errors = 0
+            for index in indexes:
+                op = ops[index]
+                try:
+                    if op["op"] == "rename":
+                        _rename(Path(op["src"]), Path(op["dst"]))
+                    else:
+                        _delete(Path(op["path"]))
+                except (PermissionError, OSError) as exc:
+                    logger.error(f"Could not apply {op}: {exc}")
+                    errors += 1
+                    continue
+                with done_lock, open(done_path, "a", encoding="utf-8") as f:
+                    f.write(f"{index}\n")
+            return errors
+
+        groups = self._groups(ops, done)
+        with ThreadPoolExecutor(
+            max_workers=min(self.workers, len(groups)) or 1,
+            thread_name_prefix="file-ops",
+        ) as executor:
+            failed = sum(executor.map(run_group, groups))
+
+        self._prune(ops)
+        self._remove(path)
+        return failed
+
+    @staticmethod
+    def _groups(ops: List[Dict[str, Any]], done: Set[int]) -> List[List[int]]:
+        """
+        Groups the pending operations so that operations sharing a path are in the
+        same group, in journal order.
+        """
+        group_of: Dict[str, int] = {}
+        groups: Dict[int, List[int]] = {}
+        for index, op in enumerate(ops):
+            if index in done:
+                continue
+            targets = {group_of[p] for p in _op_paths(op) if p in group_of}
+            group = min(targets) if targets else index
+            members = [index]
+            for other in targets - {group}:
+                members.extend(groups.pop(other))
+            groups.setdefault(group, []).extend(members)
+            groups[group].sort()
+            for member in groups[group]:
+                for p in _op_paths(ops[member]):
+                    group_of[p] = group
+        return list(groups.values())
+
+    def _prune(self, ops: List[Dict[str, Any]]) -> None:
+        """
+        Removes the directories left empty by the operations, up to the library root.
+        """
+        directories = {
+            Path(op["src"] if op["op"] == "rename" else op["path"]).parent
+            for op in ops
+        }
+        for directory in sorted(directories, key=lambda d: len(d.parts), reverse=True):
+            while directory != self.root and self.root in directory.parents:
+                try:
+                    directory.rmdir()
+                except OSError:
+                    break
+                logger.info(f"Removed empty directory {directory}")
+                directory = directory.parent
+
+    @staticmethod
+    def _load_done(path: Path) -> Set[int]:
+        done_path = path.with_suffix(".done")
+        if not done_path.exists():
+            return set()
+        with open(done_path, "r", encoding="utf-8") as f:
+            return {int(line) for line in f if line.strip().isdigit()}
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        for file in (path, path.with_suffix(".done")):
+            try:
+                file.unlink(missing_ok=True)
+            except OSError as e:
+                logger.error(f"Could not remove journal file {file}: {e}")
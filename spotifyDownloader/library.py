@@ -0,0 +1,411 @@
+"""
+Library module with an index of the songs already downloaded to DOWNLOAD_DIR.
+"""
+
+import errno
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+from spotdl.types.song import Song
+from spotdl.utils.formatter import create_file_name
+
+from settings.settings import CACHE_DIR, DOWNLOAD_DIR
+
+__all__ = ["LibraryIndex", "LIBRARY_DB_PATH", "link_file"]
+
+LIBRARY_DB_PATH = f"{CACHE_DIR}/library.sqlite"
+
+# Directories listed at once while scanning DOWNLOAD_DIR
+LIBRARY_SCAN_WORKERS = 8
+
+AUDIO_EXTENSIONS = {".mp3", ".m4a", ".flac", ".opus", ".ogg", ".wav"}
+
+# ioctl that clones a file on copy-on-write filesystems such as Btrfs and XFS
+FICLONE = 0x40049409
+
+# Errors of os.link on filesystems or devices that cannot hardlink the file
+LINK_UNSUPPORTED = {errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tracks (
+    song_id TEXT NOT NULL,
+    isrc TEXT,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    PRIMARY KEY (song_id, path)
+);
+CREATE INDEX IF NOT EXISTS tracks_path ON tracks (path);
+CREATE INDEX IF NOT EXISTS tracks_isrc ON tracks (isrc);
+"""
+
+
+def _scan_dir(directory: str) -> Tuple[List[str], Dict[str, Tuple[int, float]]]:
+    """
+    Lists a directory. Returns its subdirectories and its audio files with their
+    size and modification time.
+    """
+    subdirs = []
+    files = {}
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif os.path.splitext(entry.name)[1].lower() in AUDIO_EXTENSIONS:
+                    stat = entry.stat()
+                    files[entry.path] = (stat.st_size, stat.st_mtime)
+    except OSError as e:
+        logger.warning(f"Could not scan {directory}: {e}")
+    return subdirs, files
+
+
+def _clone_or_copy(source: str, target: str) -> None:
+    """
+    Clones a file where the filesystem supports it, otherwise copies it.
+    """
+    try:
+        import fcntl
+
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        shutil.copystat(source, target)
+        return
+    except (ImportError, OSError):
+        pass
+    shutil.copy2(source, target)
+
+
+def link_file(source: str | Path, target: str | Path) -> bool:
+    """
+    Creates `target` as a hardlink of `source`, falling back to a reflink or a copy
+    when hardlinks are not supported. The `.lrc` sidecar of `source` is linked too.
+    Args:
+        source (str | Path): An existing file.
+        target (str | Path): The file to create.
+    Returns:
+        bool: True if the target exists afterwards.
+    """
+    source, target = Path(source), Path(target)
+    if source == target:
+        return target.exists()
+    try:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        for src, dst in (
+            (source, target),
+            (source.with_suffix(".lrc"), target.with_suffix(".lrc")),
+        ):
+            if not src.exists() or dst.exists():
+                continue
+            try:
+                os.link(src, dst)
+            except OSError as e:
+                if e.errno not in LINK_UNSUPPORTED:
+                    raise
+                _clone_or_copy(str(src), str(dst))
+    except OSError as e:
+        logger.warning(f"Could not link {source} to {target}: {e}")
+        return False
+    logger.debug(f"Linked {source} to {target}")
+    return True
+
+
+class LibraryIndex:
+    """
+    Persistent index of downloaded songs: Spotify track id to path, size and mtime.
+
+    The index is rebuilt at startup by a parallel scan of DOWNLOAD_DIR, matched
+    against the expected file names of the songs in the sync store, and kept current
+    with the results of every download. Songs whose file is in the index are not
+    handed to SpotDL, so they skip the audio provider search entirely, and a track
+    already downloaded elsewhere, matched by Spotify id or ISRC, is linked instead of
+    being downloaded again.
+    """
+
+    def __init__(self, path: str = LIBRARY_DB_PATH, root: str = DOWNLOAD_DIR) -> None:
+        self.path = path
+        self.root = root
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Opens the database on first use.
+        Must be called with the index lock held.
+        """
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            columns = [
+                row[1] for row in self._conn.execute("PRAGMA table_info(tracks)")
+            ]
+            # The index is rebuilt at startup, so an old table is simply replaced
+            if columns and "isrc" not in columns:
+                self._conn.execute("DROP TABLE tracks")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def scan(self) -> Dict[str, Tuple[int, float]]:
+        """
+        Lists the audio files of the library, one directory level at a time with
+        the directories of each level listed in parallel.
+        Returns:
+            Dict[str, Tuple[int, float]]: Size and mtime by path.
+        """
+        files: Dict[str, Tuple[int, float]] = {}
+        directories = [self.root]
+        with ThreadPoolExecutor(
+            max_workers=LIBRARY_SCAN_WORKERS, thread_name_prefix="library-scan"
+        ) as executor:
+            while directories:
+                next_directories = []
+                for subdirs, found in executor.map(_scan_dir, directories):
+                    next_directories.extend(subdirs)
+                    files.update(found)
+                directories = next_directories
+        return files
+
+    def rebuild(self, entries: Iterable[Dict[str, Any]], fmt: str, restrict: Any) -> None:
+        """
+        Refreshes the index from a scan of the library and the stored sync entries.
+        Scanned songs are upserted and only rows whose file is gone are removed, so
+        downloads recorded during the scan are kept.
+        Args:
+            entries (Iterable[dict]): Sync entries, with "songs" and "output".
+            fmt (str): Audio format of the downloads.
+            restrict (Any): SpotDL restrict setting used for file names.
+        """
+        start = time.monotonic()
+        files = self.scan()
+        rows = []
+        for entry in entries:
+            for data in entry["songs"]:
+                if not data.get("song_id"):
+                    continue
+                path = str(
+                    create_file_name(
+                        Song.from_dict(data), entry["output"], fmt, restrict
+                    )
+                )
+                if path in files:
+                    rows.append(
+                        (data["song_id"], data.get("isrc"), path, *files[path])
+                    )
+        # Jobs keep recording downloads while the library is scanned, so the scan
+        # is merged into the index instead of replacing it
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO tracks VALUES (?, ?, ?, ?, ?)", rows
+                )
+            indexed = [
+                row[0] for row in conn.execute("SELECT DISTINCT path FROM tracks")
+            ]
+        scanned = {row[2] for row in rows}
+        stale = [p for p in indexed if p not in scanned and not os.path.exists(p)]
+        if stale:
+            with self._lock:
+                # Checked again, a job may have downloaded one of them since
+                stale = [p for p in stale if not os.path.exists(p)]
+                conn = self._connect()
+                with conn:
+                    conn.executemany(
+                        "DELETE FROM tracks WHERE path = ?", [(p,) for p in stale]
+                    )
+        logger.info(
+            f"Library index rebuilt: {len(rows)} songs, {len(files)} files, "
+            f"{len(stale)} removed in {time.monotonic() - start:.1f}s"
+        )
+
+    def record(self, results: Iterable[Tuple[Song, Optional[Path]]]) -> None:
+        """
+        Adds the songs downloaded successfully to the index.
+        Args:
+            results: The (song, path) results of SpotDL, path is None on failure.
+        """
+        rows = []
+        for song, path in results:
+            if not path or not song.song_id:
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            rows.append(
+                (song.song_id, song.isrc, str(path), stat.st_size, stat.st_mtime)
+            )
+        if not rows:
+            return
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO tracks VALUES (?, ?, ?, ?, ?)", rows
+                )
+
+    def lookup(self, song_id: str) -> List[str]:
+        """
+        Returns the indexed paths of a Spotify track.
+        """
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(
+                "SELECT path FROM tracks WHERE song_id = ?", (song_id,)
+            ).fetchall()
+        return [path for (path,) in rows]
+
+    def _find(self, songs: List[Song]) -> Dict[Tuple[str, str], List[str]]:
+        """
+        Returns the indexed paths of the songs, keyed by ("id", song_id) and
+        ("isrc", isrc). Must be called with the index lock held.
+        """
+        conn = self._connect()
+        found: Dict[Tuple[str, str], List[str]] = {}
+        for column in ("song_id", "isrc"):
+            values = list({getattr(song, column) for song in songs} - {None, ""})
+            # Stay under SQLite's limit of variables per statement
+            for start in range(0, len(values), 500):
+                chunk = values[start : start + 500]
+                rows = conn.execute(
+                    f"SELECT {column}, path FROM tracks WHERE {column} IN "
+                    f"({', '.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for value, path in rows:
+                    key = ("id" if column == "song_id" else "isrc", value)
+                    found.setdefault(key, []).append(path)
+        return found
+
+    def _source(
+        self, song: Song, found: Dict[Tuple[str, str], List[str]], stale: List[str]
+    ) -> str | None:
+        """
+        Returns an existing file of the same track, matched by Spotify id or ISRC.
+        Indexed files that no longer exist are added to `stale`.
+        """
+        for key in (("id", song.song_id), ("isrc", song.isrc)):
+            for path in found.get(key, []):
+                if path in stale:
+                    continue
+                if os.path.exists(path):
+                    return path
+                stale.append(path)
+        return None
+
+    def missing(
+        self,
+        songs: List[Song],
+        output: str,
+        fmt: str,
+        restrict: Any,
+        link: bool = True,
+    ) -> Tuple[List[Song], List[Song], List[Song]]:
+        """
+        Splits songs into those that still have to be downloaded, those already in
+        the library and repeats of a song that is about to be downloaded.
+
+        A song whose track is in the library under another path, e.g. in another
+        playlist, is linked to its own path instead of being downloaded again, unless
+        linking is disabled. Files removed since they were indexed are dropped from
+        the index.
+        Args:
+            songs (List[Song]): Songs to download.
+            output (str): Output pattern of the downloads.
+            fmt (str): Audio format of the downloads.
+            restrict (Any): SpotDL restrict setting used for file names.
+            link (bool): Whether other copies of a track may be linked, i.e. every
+                copy of a track has the same tags.
+        Returns:
+            Tuple[List[Song], List[Song], List[Song]]: The missing songs, the present
+                songs and the repeated songs, to link with `link_repeated`.
+        """
+        with self._lock:
+            found = self._find(songs)
+
+        missing, present, repeated, stale = [], [], [], []
+        linked = []
+        pending = set()
+        for song in songs:
+            keys = self._keys(song)
+            if not keys:
+                missing.append(song)
+                continue
+            path = str(create_file_name(song, output, fmt, restrict))
+            if path in found.get(keys[0], []) and os.path.exists(path):
+                present.append(song)
+                continue
+            if not link:
+                missing.append(song)
+                continue
+            if any(key in pending for key in keys):
+                repeated.append(song)
+                continue
+            source = self._source(song, found, stale)
+            if source is not None and link_file(source, path):
+                linked.append((song, Path(path)))
+                present.append(song)
+                continue
+            pending.update(keys)
+            missing.append(song)
+
+        if stale:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    conn.executemany(
+                        "DELETE FROM tracks WHERE path = ?", [(p,) for p in stale]
+                    )
+        self.record(linked)
+        return missing, present, repeated
+
+    def link_repeated(
+        self, songs: List[Song], output: str, fmt: str, restrict: Any
+    ) -> List[Song]:
+        """
+        Links the repeated songs returned by `missing` to the files downloaded since.
+        Args:
+            songs (List[Song]): The repeated songs.
+            output (str): Output pattern of the downloads.
+            fmt (str): Audio format of the downloads.
+            restrict (Any): SpotDL restrict setting used for file names.
+        Returns:
+            List[Song]: The songs that were linked.
+        """
+        if not songs:
+            return []
+        with self._lock:
+            found = self._find(songs)
+        linked, stale = [], []
+        for song in songs:
+            path = str(create_file_name(song, output, fmt, restrict))
+            source = self._source(song, found, stale)
+            if source is not None and link_file(source, path):
+                linked.append((song, Path(path)))
+        self.record(linked)
+        return [song for song, _ in linked]
+
+    @staticmethod
+    def _keys(song: Song) -> List[Tuple[str, str]]:
+        """
+        Returns the identities of a song: its Spotify id and its ISRC.
+        """
+        keys = []
+        if song.song_id:
+            keys.append(("id", song.song_id))
+        if song.isrc:
+            keys.append(("isrc", song.isrc))
+        return keys
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
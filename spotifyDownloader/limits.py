@@ -0,0 +1,48 @@
+"""
+Limits module with the concurrency budgets shared by every job in the process.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from settings.settings import DOWNLOAD_CONCURRENCY, SPOTIFY_CONCURRENCY
+
+__all__ = [
+    "spotify_calls",
+    "song_downloads",
+    "song_download_slot",
+    "release_song_download_slot",
+]
+
+# Concurrent Spotify metadata resolutions (parse_query, dispatch handlers)
+spotify_calls = threading.BoundedSemaphore(SPOTIFY_CONCURRENCY)
+
+# Concurrent song downloads, across all downloaders
+song_downloads = threading.BoundedSemaphore(DOWNLOAD_CONCURRENCY)
+
+_slots = threading.local()
+
+
+@contextmanager
+def song_download_slot() -> Iterator[None]:
+    """
+    Holds a slot of `song_downloads` while a song is fetched. The slot can be given
+    back early from the same thread with `release_song_download_slot`.
+    """
+    song_downloads.acquire()
+    _slots.held = True
+    try:
+        yield
+    finally:
+        release_song_download_slot()
+
+
+def release_song_download_slot() -> None:
+    """
+    Gives back the song download slot held by the current thread, if any, e.g. once
+    the audio is fetched and only post-processing is left.
+    """
+    if getattr(_slots, "held", False):
+        _slots.held = False
+        song_downloads.release()
@@ -0,0 +1,161 @@
+"""
+M3U module for writing playlist files only when their content changes.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+from loguru import logger
+from spotdl.types.song import Song
+from spotdl.utils.config import DOWNLOADER_OPTIONS
+from spotdl.utils.m3u import create_m3u_content
+
+from settings.settings import CACHE_DIR, DOWNLOAD_DIR, FILE_OPS_CONCURRENCY
+
+__all__ = ["M3UWriter", "M3U_DB_PATH", "M3U_REFRESH_SECONDS"]
+
+M3U_DB_PATH = f"{CACHE_DIR}/m3u.sqlite"
+
+# Minimum seconds between refreshes of the M3U files of a download in progress
+M3U_REFRESH_SECONDS = 30
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS playlists (
+    path TEXT PRIMARY KEY,
+    hash TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+"""
+
+
+class M3UWriter:
+    """
+    Writes the M3U8 files of playlists under DOWNLOAD_DIR/Playlists.
+
+    The hash, size and mtime of every file written are kept, so a playlist whose
+    content did not change and whose file was not touched since is not written
+    again, and media servers only rescan the playlists that changed. Files are
+    written to a temporary file and renamed into place, so a reader never sees a
+    partial playlist. Several playlists are written in parallel.
+    """
+
+    def __init__(
+        self,
+        path: str = M3U_DB_PATH,
+        root: str = DOWNLOAD_DIR,
+        workers: int = FILE_OPS_CONCURRENCY,
+    ) -> None:
+        self.path = path
+        self.root = Path(root)
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Opens the database on first use.
+        Must be called with the writer lock held.
+        """
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def file_path(self, list_name: str) -> Path:
+        return self.root / "Playlists" / list_name / f"{list_name}.m3u8"
+
+    @staticmethod
+    def content(songs: List[Song]) -> str:
+        return create_m3u_content(
+            song_list=songs,
+            template="{artists} - {title}.{output-ext}",
+            file_extension=DOWNLOADER_OPTIONS["format"],
+            restrict=DOWNLOADER_OPTIONS["restrict"],
+            short=False,
+            detect_formats=DOWNLOADER_OPTIONS["detect_formats"],
+        )
+
+    def write(self, list_name: str, songs: List[Song]) -> bool:
+        """
+        Writes the M3U8 file of a playlist if its content changed.
+        Args:
+            list_name (str): The name of the playlist.
+            songs (List[Song]): The songs of the playlist, in order.
+        Returns:
+            bool: True if the file was written.
+        """
+        file_path = self.file_path(list_name)
+        data = self.content(songs).encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT hash, size, mtime_ns FROM playlists WHERE path = ?",
+                    (str(file_path),),
+                )
+                .fetchone()
+            )
+        if row and row[0] == digest:
+            try:
+                stat = file_path.stat()
+            except OSError:
+                stat = None
+            if stat and (stat.st_size, stat.st_mtime_ns) == (row[1], row[2]):
+                logger.debug(f"M3U file unchanged: {file_path}")
+                return False
+
+        tmp_path = file_path.with_name(f".{file_path.name}.tmp")
+        try:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "wb") as m3u_file:
+                m3u_file.write(data)
+            os.replace(tmp_path, file_path)
+            stat = file_path.stat()
+        except Exception as e:
+            logger.error(f"Error writing M3U file {file_path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return False
+
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO playlists VALUES (?, ?, ?, ?)",
+                    (str(file_path), digest, stat.st_size, stat.st_mtime_ns),
+                )
+        logger.info(f"M3U file generated: {file_path}")
+        return True
+
+    def write_all(self, playlists: Dict[str, List[Song]]) -> int:
+        """
+        Writes the M3U8 files of several playlists in parallel.
+        Args:
+            playlists (Dict[str, List[Song]]): The songs of each playlist, by name.
+        Returns:
+            int: The number of files written.
+        """
+        if len(playlists) <= 1:
+            return sum(self.write(name, songs) for name, songs in playlists.items())
+        with ThreadPoolExecutor(
+            max_workers=min(self.workers, len(playlists)), thread_name_prefix="m3u"
+        ) as executor:
+            written = sum(
+                executor.map(lambda item: self.write(*item), playlists.items())
+            )
+        logger.info(f"{written} of {len(playlists)} M3U files changed")
+        return written
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
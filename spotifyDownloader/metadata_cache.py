@@ -0,0 +1,264 @@
+"""
+Metadata cache module for reusing Spotify metadata across downloads and syncs.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Type
+
+from loguru import logger
+from spotdl.types.song import Song, SongList
+
+from settings.settings import CACHE_DIR, METADATA_CACHE_MAX_MB, SAVED_FULL_SYNC_HOURS
+
+__all__ = [
+    "MetadataCache",
+    "METADATA_CACHE_PATH",
+    "METADATA_TTLS",
+    "metadata_cache",
+    "spotify_id",
+    "load_song",
+    "load_song_list",
+]
+
+METADATA_CACHE_PATH = f"{CACHE_DIR}/metadata.sqlite"
+
+# Seconds an entry is valid, per kind of metadata.
+# Released tracks and albums rarely change; playlists and the user library often do.
+METADATA_TTLS = {
+    "track": 30 * 24 * 3600,
+    "album": 7 * 24 * 3600,
+    "album_tracks": 7 * 24 * 3600,
+    "artist": 24 * 3600,
+    "artist_albums": 24 * 3600,
+    # playlists are validated by their snapshot_id when it is known
+    "playlist": 24 * 3600,
+    # the incremental listing of saved tracks, refreshed in full periodically
+    "saved": SAVED_FULL_SYNC_HOURS * 3600,
+}
+
+
+def spotify_id(url: str) -> str:
+    """
+    Returns the Spotify ID of a URL, URI or ID.
+    """
+    return re.split(r"[/:]", url.split("?")[0].rstrip("/"))[-1]
+
+
+class MetadataCache:
+    """
+    Persistent cache of Spotify metadata, stored as JSON in a SQLite database.
+
+    Entries are keyed by kind and Spotify ID and expire after the TTL of their kind.
+    The total size of the stored values is kept under max_bytes by evicting the
+    least recently used entries. Hits and misses are counted to report the hit rate.
+    A max_bytes of 0 disables the cache.
+    """
+
+    def __init__(
+        self,
+        path: str = METADATA_CACHE_PATH,
+        max_bytes: int = METADATA_CACHE_MAX_MB * 1024 * 1024,
+    ) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._size = 0
+
+    def _connect(self) -> sqlite3.Connection | None:
+        """
+        Opens the database on first use.
+        Must be called with the cache lock held.
+        """
+        if self._conn is None and self.max_bytes > 0:
+            try:
+                self._conn = sqlite3.connect(
+                    self.path, check_same_thread=False, isolation_level=None
+                )
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS metadata ("
+                    "kind TEXT NOT NULL, id TEXT NOT NULL, value TEXT NOT NULL, "
+                    "size INTEGER NOT NULL, expires_at REAL NOT NULL, "
+                    "accessed_at REAL NOT NULL, PRIMARY KEY (kind, id))"
+                )
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS metadata_accessed "
+                    "ON metadata (accessed_at)"
+                )
+                self._conn.execute(
+                    "DELETE FROM metadata WHERE expires_at < ?", (time.time(),)
+                )
+                self._size = self._conn.execute(
+                    "SELECT COALESCE(SUM(size), 0) FROM metadata"
+                ).fetchone()[0]
+            except sqlite3.Error as e:
+                logger.error(f"Error opening metadata cache {self.path}: {e}")
+                self._conn = None
+                self.max_bytes = 0
+        return self._conn
+
+    def get(self, kind: str, key: str) -> Any | None:
+        """
+        Returns the cached value, or None if it is missing or expired.
+        Args:
+            kind (str): Kind of metadata, one of METADATA_TTLS.
+            key (str): Spotify ID of the item.
+        """
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return None
+            now = time.time()
+            try:
+                row = conn.execute(
+                    "SELECT value, size, expires_at FROM metadata "
+                    "WHERE kind = ? AND id = ?",
+                    (kind, key),
+                ).fetchone()
+                if row and row[2] < now:
+                    conn.execute(
+                        "DELETE FROM metadata WHERE kind = ? AND id = ?", (kind, key)
+                    )
+                    self._size -= row[1]
+                    row = None
+                if row is None:
+                    self.misses += 1
+                    return None
+                conn.execute(
+                    "UPDATE metadata SET accessed_at = ? WHERE kind = ? AND id = ?",
+                    (now, kind, key),
+                )
+            except sqlite3.Error as e:
+                logger.error(f"Error reading metadata cache: {e}")
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, kind: str, key: str, value: Any) -> None:
+        """
+        Stores a JSON-serializable value and evicts old entries if the cache is full.
+        Args:
+            kind (str): Kind of metadata, one of METADATA_TTLS.
+            key (str): Spotify ID of the item.
+            value (Any): The metadata to store.
+        """
+        data = json.dumps(value, ensure_ascii=False)
+        size = len(data.encode("utf-8"))
+        with self._lock:
+            conn = self._connect()
+            if conn is None or size > self.max_bytes:
+                return
+            now = time.time()
+            try:
+                row = conn.execute(
+                    "SELECT size FROM metadata WHERE kind = ? AND id = ?", (kind, key)
+                ).fetchone()
+                conn.execute(
+                    "INSERT OR REPLACE INTO metadata VALUES (?, ?, ?, ?, ?, ?)",
+                    (kind, key, data, size, now + METADATA_TTLS[kind], now),
+                )
+                self._size += size - (row[0] if row else 0)
+                self._evict()
+            except sqlite3.Error as e:
+                logger.error(f"Error writing metadata cache: {e}")
+
+    def _evict(self) -> None:
+        """
+        Deletes the least recently used entries until the cache fits in max_bytes.
+        Must be called with the cache lock held.
+        """
+        while self._size > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT kind, id, size FROM metadata ORDER BY accessed_at LIMIT 100"
+            ).fetchall()
+            if not rows:
+                self._size = 0
+                return
+            for kind, key, size in rows:
+                self._conn.execute(
+                    "DELETE FROM metadata WHERE kind = ? AND id = ?", (kind, key)
+                )
+                self._size -= size
+                self.evictions += 1
+                if self._size <= self.max_bytes:
+                    return
+
+    def get_or_fetch(self, kind: str, key: str, fetch: Callable[[], Any]) -> Any:
+        """
+        Returns the cached value, calling fetch and caching its result on a miss.
+        """
+        value = self.get(kind, key)
+        if value is None:
+            value = fetch()
+            if value is not None:
+                self.set(kind, key, value)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the hit and miss counters and the current size of the cache.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "bytes": self._size,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+metadata_cache = MetadataCache()
+
+
+def load_song(url: str) -> Song:
+    """
+    Returns the song with the given URL, reading through the metadata cache.
+    """
+    data = metadata_cache.get_or_fetch(
+        "track", spotify_id(url), lambda: Song.from_url(url).json
+    )
+    return Song.from_dict(data)
+
+
+def load_song_list(
+    cls: Type[SongList], kind: str, url: str, version: str | None = None
+) -> SongList:
+    """
+    Returns the song list (album, playlist, saved...) with the given URL,
+    reading through the metadata cache. Same as `cls.from_url(url, fetch_songs=False)`.
+    Args:
+        cls (Type[SongList]): The SongList subclass to build.
+        kind (str): Kind of metadata, one of METADATA_TTLS.
+        url (str): The URL of the list.
+        version (str | None): Current version of the list, e.g. a playlist snapshot_id.
+            A cached entry stored for another version is fetched again.
+    """
+    key = spotify_id(url)
+    data = metadata_cache.get(kind, key)
+    if data is None or (version is not None and data.get("version") != version):
+        metadata, songs = cls.get_metadata(url)
+        data = {
+            "metadata": metadata,
+            "songs": [song.json for song in songs],
+            "version": version,
+        }
+        metadata_cache.set(kind, key, data)
+    songs = [Song.from_dict(song) for song in data["songs"]]
+    return cls(**data["metadata"], urls=[song.url for song in songs], songs=songs)
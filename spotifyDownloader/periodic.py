@@ -0,0 +1,280 @@
+"""
+Periodic module for running sync categories on a schedule inside the bot process.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict
+
+from loguru import logger
+
+from settings.settings import CACHE_DIR, SYNC_JITTER_PERCENT, SYNC_SCHEDULE
+
+if TYPE_CHECKING:
+    from spotifyDownloader.jobs import Job, JobQueue
+
+__all__ = ["PeriodicSync", "parse_schedule", "SYNC_CATEGORIES", "PERIODIC_JSON_PATH"]
+
+PERIODIC_JSON_PATH = f"{CACHE_DIR}/periodic_sync.json"
+
+# Queries accepted by /sync
+SYNC_CATEGORIES = (
+    "songs",
+    "albums",
+    "artists",
+    "playlists",
+    "saved",
+    "all-user-saved-albums",
+    "all-saved-playlists",
+    "all-user-playlists",
+    "all-user-followed-artists",
+)
+
+# Longest sleep of the scheduler thread while a periodic sync is running
+POLL_INTERVAL = 60.0
+
+# Runs kept per category in the state file
+MAX_RUNS = 20
+
+
+def parse_schedule(schedule: str) -> Dict[str, float]:
+    """
+    Parses a schedule such as "saved=60,playlists=360".
+    Invalid pairs are logged and ignored.
+    Args:
+        schedule (str): Comma separated "category=minutes" pairs.
+    Returns:
+        Dict[str, float]: The interval in seconds of each category.
+    """
+    intervals = {}
+    for pair in schedule.split(","):
+        if not pair.strip():
+            continue
+        category, _, minutes = pair.partition("=")
+        category = category.strip()
+        try:
+            interval = float(minutes) * 60
+        except ValueError:
+            interval = 0
+        if category not in SYNC_CATEGORIES or interval <= 0:
+            logger.warning(f"Invalid entry in `SYNC_SCHEDULE`: {pair.strip()}")
+            continue
+        intervals[category] = interval
+    return intervals
+
+
+class PeriodicSync:
+    """
+    Submits sync jobs for each scheduled category at its interval.
+
+    Every run is delayed by a random jitter of up to SYNC_JITTER_PERCENT of the
+    interval, so categories drift apart instead of hitting the API together. A
+    category is never submitted while its previous sync is queued or running; the
+    run is skipped and tried again after another interval. Syncs run quietly, so
+    the chat only hears about failed entries, and categories without sync entries
+    are not scheduled. Next runs and the timings of past runs are kept in
+    CACHE_DIR, so a restart does not trigger a catch-up of every category at once.
+    """
+
+    def __init__(
+        self,
+        jobs: "JobQueue",
+        schedule: str = SYNC_SCHEDULE,
+        jitter_percent: int = SYNC_JITTER_PERCENT,
+        path: str = PERIODIC_JSON_PATH,
+    ) -> None:
+        self.jobs = jobs
+        self.intervals = parse_schedule(schedule)
+        self.jitter = jitter_percent / 100
+        self.path = Path(path)
+        self._state: Dict[str, Dict[str, Any]] = {}
+        self._active: Dict[str, "Job"] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """
+        Starts the scheduler thread. Does nothing if no category with sync entries
+        is scheduled.
+        """
+        if self._thread:
+            return
+        sync_types = self.jobs.downloader.sync_store.sync_types()
+        for category in [c for c in self.intervals if c not in sync_types]:
+            logger.warning(
+                f"Periodic sync of {category} disabled, it has no sync entries"
+            )
+            del self.intervals[category]
+        if not self.intervals:
+            return
+        self._state = self._load()
+        now = time.time()
+        for category, interval in self.intervals.items():
+            state = self._state.setdefault(category, {"runs": [], "skipped": 0})
+            next_run = state.get("next_run")
+            if next_run is None:
+                # Spread the first runs over the interval instead of all at startup
+                state["next_run"] = now + random.uniform(0, interval)
+            elif next_run < now:
+                state["next_run"] = now + self._jitter(interval)
+        self._persist()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._loop, name="periodic-sync", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            "Periodic sync started: "
+            + ", ".join(
+                f"{category} every {interval / 60:g} min"
+                for category, interval in self.intervals.items()
+            )
+        )
+
+    def stop(self, timeout: float | None = None) -> None:
+        """
+        Stops the scheduler thread. Submitted syncs keep running in the job queue.
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _jitter(self, interval: float) -> float:
+        return random.uniform(0, interval * self.jitter)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._tick(time.time())
+            except Exception as e:
+                logger.error(f"Periodic sync error: {e}")
+            self._stop.wait(self._sleep_time(time.time()))
+
+    def _sleep_time(self, now: float) -> float:
+        """
+        Returns the seconds until the next due category, or until the next check of
+        the running syncs.
+        """
+        timeout = min(state["next_run"] for state in self._state.values()) - now
+        if self._active:
+            timeout = min(timeout, POLL_INTERVAL)
+        return max(1.0, timeout)
+
+    def _tick(self, now: float) -> None:
+        """
+        Records the syncs that finished and submits the categories that are due.
+        """
+        changed = self._collect()
+        for category, interval in self.intervals.items():
+            state = self._state[category]
+            if state["next_run"] > now:
+                continue
+            state["next_run"] = now + interval + self._jitter(interval)
+            changed = True
+            if category in self._active:
+                state["skipped"] += 1
+                logger.warning(f"Periodic sync of {category} skipped, still running")
+                continue
+            job, queued = self.jobs.submit("sync", category, quiet=True)
+            if not queued:
+                state["skipped"] += 1
+                logger.warning(
+                    f"Periodic sync of {category} skipped, job {job.id} "
+                    f"already {job.status}"
+                )
+                continue
+            self._active[category] = job
+            logger.info(f"Periodic sync of {category} queued as job {job.id}")
+        if changed:
+            self._persist()
+
+    def _collect(self) -> bool:
+        """
+        Records the timings of the periodic syncs that have finished.
+        Returns True if any run was recorded.
+        """
+        finished = [
+            (category, job)
+            for category, job in self._active.items()
+            if job.finished
+        ]
+        for category, job in finished:
+            del self._active[category]
+            run = {
+                "job": job.id,
+                "status": job.status,
+                "queued_at": job.created_at,
+                "started_at": job.started_at,
+                "finished_at": job.finished_at,
+                "wait": round((job.started_at or job.created_at) - job.created_at, 1),
+                "duration": round(
+                    (job.finished_at or time.time())
+                    - (job.started_at or job.created_at),
+                    1,
+                ),
+            }
+            runs = self._state[category]["runs"]
+            runs.append(run)
+            del runs[:-MAX_RUNS]
+            logger.info(
+                f"Periodic sync of {category} {run['status']} in {run['duration']}s "
+                f"after waiting {run['wait']}s"
+            )
+        return bool(finished)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns, per category, the next run, the last run and the number of
+        skipped runs.
+        """
+        return {
+            category: {
+                "interval": self.intervals[category],
+                "next_run": state["next_run"],
+                "running": category in self._active,
+                "skipped": state["skipped"],
+                "last_run": state["runs"][-1] if state["runs"] else None,
+            }
+            for category, state in self._state.items()
+            if category in self.intervals
+        }
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Reads the schedule state of the previous run of the bot.
+        """
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.error(f"Error reading periodic sync file {self.path}: {e}")
+            return {}
+        state = {}
+        for category, entry in data.get("categories", {}).items():
+            if category not in self.intervals or not isinstance(entry, dict):
+                continue
+            state[category] = {
+                "next_run": entry.get("next_run"),
+                "runs": entry.get("runs", [])[-MAX_RUNS:],
+                "skipped": entry.get("skipped", 0),
+            }
+        return state
+
+    def _persist(self) -> None:
+        """
+        Atomically writes the schedule state.
+        """
+        tmp_path = self.path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"categories": self._state}, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Error writing periodic sync file {self.path}: {e}")
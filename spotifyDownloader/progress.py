@@ -0,0 +1,180 @@
+"""
+Progress module for showing the progress of running jobs in their status message.
+"""
+
+import threading
+import time
+from typing import List
+
+import telebot
+from loguru import logger
+
+from core.locale import get_text
+from settings.settings import PROGRESS_EDIT_SECONDS, TELEGRAM_GROUP
+
+__all__ = ["JobProgress", "ProgressBoard", "progress_board"]
+
+
+class JobProgress:
+    """
+    Song counters of a job, updated by the download threads.
+
+    Updating the counters only takes a lock and marks the progress as changed; the
+    status message is edited later by the ProgressBoard, so reporting never waits
+    on Telegram.
+    """
+
+    def __init__(
+        self, bot: telebot.TeleBot | None, message_id: int | None, title: str
+    ) -> None:
+        self.bot = bot
+        self.message_id = message_id
+        self.title = title
+        self.total = 0
+        self.done = 0
+        self.failed = 0
+        self.downloaded = 0
+        self.started_at = time.monotonic()
+        self.edited_at = 0.0
+        self.changed = False
+        self._lock = threading.Lock()
+
+    def add(self, total: int = 0, done: int = 0, failed: int = 0) -> None:
+        """
+        Adds songs to the job and records completed or failed songs.
+        Args:
+            total (int): Songs added to the job.
+            done (int): Songs completed without a download, e.g. already on disk.
+            failed (int): Songs that could not be completed.
+        """
+        with self._lock:
+            self.total += total
+            self.done += done
+            self.failed += failed
+            self.changed = True
+
+    def song_done(self, success: bool) -> None:
+        """
+        Records the result of a song download.
+        """
+        with self._lock:
+            self.downloaded += 1
+            if success:
+                self.done += 1
+            else:
+                self.failed += 1
+            self.changed = True
+
+    def render(self) -> str:
+        """
+        Returns the status message text and clears the changed flag.
+        """
+        with self._lock:
+            self.changed = False
+            elapsed = max(time.monotonic() - self.started_at, 1.0)
+            # Songs already on disk complete instantly, so only downloads count
+            rate = self.downloaded / elapsed * 60
+            remaining = max(self.total - self.done - self.failed, 0)
+            if rate > 0 and remaining:
+                eta = f"{remaining / rate:.0f} min"
+            else:
+                eta = "—"
+            return (
+                f"{self.title}\n"
+                + get_text(
+                    "job_progress",
+                    done=self.done,
+                    total=self.total,
+                    failed=self.failed,
+                    rate=f"{rate:.1f}",
+                    eta=eta,
+                )
+            )
+
+
+class ProgressBoard:
+    """
+    Edits the status messages of running jobs from a single background thread.
+
+    Every job's updates are coalesced into its next edit, and the chat gets at most
+    one edit every PROGRESS_EDIT_SECONDS, shared round-robin by the running jobs,
+    so progress stays under Telegram's edit limits. A 429 response pauses all edits
+    for its retry_after.
+    """
+
+    def __init__(self, interval: float = PROGRESS_EDIT_SECONDS) -> None:
+        self.interval = interval
+        self._jobs: List[JobProgress] = []
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+
+    def register(self, progress: JobProgress) -> None:
+        """
+        Starts editing the status message of a job.
+        """
+        if progress.bot is None or progress.message_id is None:
+            return
+        with self._cond:
+            self._jobs.append(progress)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._loop, name="progress", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify_all()
+
+    def unregister(self, progress: JobProgress) -> None:
+        """
+        Stops editing the status message of a job, e.g. before deleting it.
+        """
+        with self._cond:
+            if progress in self._jobs:
+                self._jobs.remove(progress)
+
+    def _next(self) -> JobProgress:
+        """
+        Blocks until a job has changed and returns the one edited least recently.
+        """
+        with self._cond:
+            while True:
+                changed = [progress for progress in self._jobs if progress.changed]
+                if changed:
+                    return min(changed, key=lambda progress: progress.edited_at)
+                self._cond.wait(self.interval)
+
+    def _loop(self) -> None:
+        while True:
+            progress = self._next()
+            delay = self._edit(progress)
+            time.sleep(max(delay, self.interval))
+
+    def _edit(self, progress: JobProgress) -> float:
+        """
+        Edits the status message of a job.
+        Returns:
+            float: Seconds Telegram asked to wait before the next edit, if any.
+        """
+        progress.edited_at = time.monotonic()
+        try:
+            progress.bot.edit_message_text(
+                progress.render(),
+                chat_id=TELEGRAM_GROUP,
+                message_id=progress.message_id,
+                parse_mode="markdown",
+            )
+        except Exception as e:
+            if getattr(e, "error_code", None) == 429:
+                parameters = (getattr(e, "result_json", None) or {}).get(
+                    "parameters", {}
+                )
+                retry_after = float(parameters.get("retry_after", self.interval))
+                logger.warning(f"Progress edits rate limited for {retry_after}s")
+                with progress._lock:
+                    progress.changed = True
+                return retry_after
+            if "message is not modified" not in str(e):
+                logger.warning(f"Failed to edit progress message: {e}")
+        return 0.0
+
+
+progress_board = ProgressBoard()
@@ -0,0 +1,175 @@
+"""
+Rate limit module for sharing the Spotify Web API budget across all jobs.
+"""
+
+import random
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from loguru import logger
+from spotdl.utils.spotify import SpotifyClient
+from spotipy.exceptions import SpotifyException
+
+from settings.settings import SPOTIFY_MAX_RETRIES, SPOTIFY_REQUESTS_PER_SECOND
+
+__all__ = ["TokenBucket", "RateLimiter", "rate_limiter", "get_spotify_client"]
+
+# Backoff before retrying a 429 response that has no Retry-After header
+BASE_BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. Every request takes a token; tokens are refilled at
+    `rate` per second up to `capacity`, so short bursts are allowed but the average
+    rate is bounded. The bucket can also be paused, e.g. while Spotify asks to wait.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Blocks until a token is available.
+        Returns:
+            float: Seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                else:
+                    delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """
+        Stops handing out tokens for the given number of seconds.
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0
+
+
+class RateLimiter:
+    """
+    Wraps the calls of the shared SpotifyClient.
+
+    Every request takes a token from a bucket shared by all threads and jobs. A 429
+    response pauses the whole bucket for its Retry-After (or an exponential backoff),
+    with jitter so that waiting threads do not retry at the same instant, and the
+    request is retried up to `max_retries` times, so bulk jobs slow down instead of
+    failing.
+    """
+
+    def __init__(
+        self,
+        rate: float = SPOTIFY_REQUESTS_PER_SECOND,
+        max_retries: int = SPOTIFY_MAX_RETRIES,
+    ) -> None:
+        self.bucket = TokenBucket(rate)
+        self.max_retries = max_retries
+        self.requests = 0
+        self.rate_limited = 0
+        self.throttled_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def call(self, request: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Performs a request within the rate limit, retrying it on 429 responses.
+        """
+        attempt = 0
+        while True:
+            waited = self.bucket.acquire()
+            with self._lock:
+                self.requests += 1
+                self.throttled_seconds += waited
+            try:
+                return request(*args, **kwargs)
+            except SpotifyException as e:
+                if e.http_status != 429 or attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                delay = self._retry_after(e, attempt)
+                with self._lock:
+                    self.rate_limited += 1
+                    self.throttled_seconds += delay
+                logger.warning(
+                    f"Spotify rate limit hit, retrying in {delay:.1f}s "
+                    f"(attempt {attempt}/{self.max_retries})"
+                )
+                self.bucket.pause(delay)
+
+    @staticmethod
+    def _retry_after(error: SpotifyException, attempt: int) -> float:
+        """
+        Returns the seconds to wait before retrying: the Retry-After header if present,
+        otherwise an exponential backoff, plus up to 10% of jitter.
+        """
+        headers = getattr(error, "headers", None) or {}
+        try:
+            delay = float(headers.get("Retry-After"))
+        except (TypeError, ValueError):
+            delay = min(MAX_BACKOFF, BASE_BACKOFF * 2 ** (attempt - 1))
+        return delay + random.uniform(0, delay * 0.1)
+
+    def install(self, client: SpotifyClient) -> SpotifyClient:
+        """
+        Routes every request of the client through the rate limiter.
+        spotdl shares a single client, so this also covers the requests made by spotdl.
+        """
+        with self._lock:
+            if getattr(client, "_rate_limiter", None) is not self:
+                self._wrap(client)
+        return client
+
+    def _wrap(self, client: SpotifyClient) -> None:
+        # 429 responses are handled here, so the HTTP session must not retry them
+        status_forcelist = getattr(client, "status_forcelist", None)
+        if status_forcelist and 429 in status_forcelist:
+            client.status_forcelist = tuple(s for s in status_forcelist if s != 429)
+            if hasattr(client, "_build_session"):
+                client._build_session()
+        internal_call = client._internal_call
+        client._internal_call = lambda *args, **kwargs: self.call(
+            internal_call, *args, **kwargs
+        )
+        client._rate_limiter = self
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the number of requests, rate limited responses and throttled time.
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "rate_limited": self.rate_limited,
+                "throttled_seconds": round(self.throttled_seconds, 1),
+            }
+
+
+rate_limiter = RateLimiter()
+
+
+def get_spotify_client() -> SpotifyClient:
+    """
+    Returns the shared SpotifyClient with the rate limiter installed.
+    """
+    return rate_limiter.install(SpotifyClient())
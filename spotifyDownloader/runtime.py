@@ -0,0 +1,144 @@
+"""
+Runtime module with long-lived SpotDL downloaders shared by every job.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
+
+from loguru import logger
+from spotdl.download.downloader import Downloader
+from spotdl.types.song import Song
+from spotdl.utils.config import DOWNLOADER_OPTIONS
+
+from settings.settings import DOWNLOAD_WORKERS, SYNC_CONCURRENCY
+from spotifyDownloader.conversion import ConversionPool
+from spotifyDownloader.limits import song_download_slot
+
+if TYPE_CHECKING:
+    from spotifyDownloader.progress import JobProgress
+
+__all__ = ["DownloaderRuntime", "LimitedDownloader"]
+
+
+class LimitedDownloader(Downloader):
+    """
+    SpotDL Downloader that takes a slot of the global download budget for every song,
+    so concurrent jobs never fetch more songs at once than DOWNLOAD_CONCURRENCY.
+    The slot is given back once the audio is fetched, before conversion and tagging.
+    The result of every song is reported to the progress of the job, if any.
+    """
+
+    progress: Optional["JobProgress"] = None
+
+    def search_and_download(self, song: Song):
+        with song_download_slot():
+            try:
+                result = super().search_and_download(song)
+            except Exception:
+                if self.progress:
+                    self.progress.song_done(False)
+                raise
+        if self.progress:
+            self.progress.song_done(result[1] is not None)
+        return result
+
+
+class DownloaderRuntime:
+    """
+    Pool of long-lived SpotDL downloaders.
+
+    Creating a Downloader sets up an asyncio loop, a thread pool, the progress handler
+    and the audio and lyrics provider clients. Instead of paying that for every download
+    and sync entry, downloaders are created on first use and checked out by jobs.
+    A Downloader drives its own loop, so each one serves a single job at a time.
+
+    Settings that are read per song, such as "output", can be overridden per checkout
+    and are restored when the downloader is returned to the pool.
+
+    Conversion and tagging of every downloader run on the shared ConversionPool.
+    """
+
+    def __init__(self, settings: Dict[str, Any] | None = None, max_idle: int | None = None):
+        self.settings = dict(DOWNLOADER_OPTIONS if settings is None else settings)
+        # Several jobs run at once; the rich TUI only allows one live display.
+        self.settings["simple_tui"] = True
+        self.max_idle = max_idle or DOWNLOAD_WORKERS * SYNC_CONCURRENCY
+        self._idle: List[Downloader] = []
+        self._lock = threading.Lock()
+        self.conversion = ConversionPool()
+        self.created = 0
+        self.reused = 0
+
+    def start(self) -> None:
+        """
+        Starts the conversion processes. Must be called before any job thread starts.
+        """
+        self.conversion.start()
+
+    def _create(self) -> Downloader:
+        """
+        Creates a SpotDL Downloader with the base settings and its own event loop.
+        """
+        self.created += 1
+        return LimitedDownloader(settings=dict(self.settings), loop=None)
+
+    def _close(self, downloader: Downloader) -> None:
+        """
+        Closes the downloader's progress handler to avoid file descriptor leaks.
+        """
+        if hasattr(downloader, "progress_handler"):
+            try:
+                downloader.progress_handler.close()
+            except Exception as e:
+                logger.error(f"Error closing progress handler: {e}")
+
+    def _acquire(self) -> Downloader:
+        with self._lock:
+            if self._idle:
+                self.reused += 1
+                return self._idle.pop()
+        return self._create()
+
+    def _release(self, downloader: Downloader) -> None:
+        if hasattr(downloader, "errors"):
+            downloader.errors = []
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(downloader)
+                return
+        self._close(downloader)
+
+    @contextmanager
+    def downloader(
+        self, progress: Optional["JobProgress"] = None, **overrides: Any
+    ) -> Iterator[Downloader]:
+        """
+        Checks out a downloader for the duration of a job.
+        Args:
+            progress (JobProgress | None): Progress of the job, to report songs to.
+            **overrides: Settings to use for this job only, e.g. output="...".
+        Yields:
+            Downloader: A downloader owned by the caller until the block exits.
+        """
+        downloader = self._acquire()
+        base_settings = dict(downloader.settings)
+        downloader.settings.update(overrides)
+        downloader.progress = progress
+        try:
+            yield downloader
+        finally:
+            downloader.progress = None
+            downloader.settings.clear()
+            downloader.settings.update(base_settings)
+            self._release(downloader)
+
+    def close(self) -> None:
+        """
+        Closes every idle downloader and stops the conversion processes.
+        """
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for downloader in idle:
+            self._close(downloader)
+        self.conversion.shutdown()
@@ -0,0 +1,215 @@
+"""
+Saved module for retrieving the user's saved tracks incrementally.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from loguru import logger
+from spotdl.types.saved import Saved, SavedError
+from spotdl.types.song import Song
+from spotdl.utils.spotify import SpotifyClient
+
+from settings.settings import SAVED_FULL_SYNC_HOURS, SPOTIFY_CONCURRENCY
+from spotifyDownloader.metadata_cache import metadata_cache
+from spotifyDownloader.ratelimit import get_spotify_client
+
+__all__ = ["load_saved"]
+
+# Maximum page size of the saved tracks endpoint
+SAVED_TRACKS_PAGE_SIZE = 50
+
+
+def load_saved(url: str = "saved") -> Saved:
+    """
+    Get the saved tracks of the user, reading through the metadata cache.
+
+    The cached listing keeps the `added_at` of its newest track. Spotify returns saved
+    tracks newest first, so only the pages with tracks added since then are fetched.
+    Removed tracks are reconciled by a full listing every SAVED_FULL_SYNC_HOURS.
+
+    ### Arguments
+    - url: The URL of the saved tracks, always "saved".
+
+    ### Returns
+    - The saved tracks.
+    """
+
+    if url != "saved":
+        raise SavedError("Invalid URL")
+
+    spotify_client = get_spotify_client()
+    if spotify_client.user_auth is False:  # type: ignore
+        raise SavedError("You must be logged in to use this function")
+
+    data = metadata_cache.get("saved", url)
+    if data is None or time.time() - data["full_at"] > SAVED_FULL_SYNC_HOURS * 3600:
+        data = _get_all_saved(spotify_client, url)
+    else:
+        data = _update_saved(spotify_client, data)
+    metadata_cache.set("saved", url, data)
+
+    songs = [Song.from_dict(song) for song in data["songs"]]
+    return Saved(**data["metadata"], urls=[song.url for song in songs], songs=songs)
+
+
+def _get_saved_page(spotify_client: SpotifyClient, offset: int) -> Dict[str, Any]:
+    """
+    Get a page of saved tracks.
+    """
+
+    response = spotify_client.current_user_saved_tracks(
+        limit=SAVED_TRACKS_PAGE_SIZE, offset=offset
+    )
+    if response is None:
+        raise SavedError("Couldn't get saved tracks")
+
+    return response
+
+
+def _get_all_saved(spotify_client: SpotifyClient, url: str) -> Dict[str, Any]:
+    """
+    Get all the saved tracks. Pages after the first are fetched concurrently.
+
+    ### Arguments
+    - spotify_client: The Spotify client.
+    - url: The URL of the saved tracks.
+
+    ### Returns
+    - The cache entry of the saved tracks.
+    """
+
+    first_page = _get_saved_page(spotify_client, 0)
+    offsets = range(
+        SAVED_TRACKS_PAGE_SIZE, first_page["total"], SAVED_TRACKS_PAGE_SIZE
+    )
+    with ThreadPoolExecutor(max_workers=SPOTIFY_CONCURRENCY) as executor:
+        pages = [first_page] + list(
+            executor.map(
+                lambda offset: _get_saved_page(spotify_client, offset), offsets
+            )
+        )
+
+    items = [item for page in pages for item in page["items"]]
+    logger.info(f"Fetched all {len(items)} saved tracks")
+
+    return {
+        "metadata": {"name": "Saved tracks", "url": url},
+        "songs": [_get_saved_song(item).json for item in _valid_items(items)],
+        "cursor": items[0]["added_at"] if items else None,
+        "full_at": time.time(),
+    }
+
+
+def _update_saved(
+    spotify_client: SpotifyClient, data: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Add the tracks saved since the cached listing was made.
+
+    ### Arguments
+    - spotify_client: The Spotify client.
+    - data: The cache entry of the saved tracks.
+
+    ### Returns
+    - The updated cache entry.
+    """
+
+    cursor = data["cursor"]
+    known_ids = {song["song_id"] for song in data["songs"]}
+
+    new_items: List[Dict[str, Any]] = []
+    offset = 0
+    reached_cursor = False
+    while not reached_cursor:
+        page = _get_saved_page(spotify_client, offset)
+        for item in page["items"]:
+            track_id = (item.get("track") or {}).get("id")
+            if cursor and (
+                item["added_at"] < cursor
+                or (item["added_at"] == cursor and track_id in known_ids)
+            ):
+                reached_cursor = True
+                break
+            new_items.append(item)
+        offset += SAVED_TRACKS_PAGE_SIZE
+        if not page["next"]:
+            break
+
+    if not new_items:
+        return data
+
+    new_songs = [_get_saved_song(item).json for item in _valid_items(new_items)]
+    # tracks saved again move to the top
+    new_ids = {song["song_id"] for song in new_songs}
+    old_songs = [song for song in data["songs"] if song["song_id"] not in new_ids]
+    logger.info(f"Found {len(new_songs)} new saved tracks")
+
+    return {
+        **data,
+        "songs": new_songs + old_songs,
+        "cursor": new_items[0]["added_at"],
+    }
+
+
+def _valid_items(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Filter out local and unavailable tracks.
+    """
+
+    return [
+        item
+        for item in items
+        if isinstance(item, dict)
+        and item.get("track")
+        and not item["track"].get("is_local")
+    ]
+
+
+def _get_saved_song(item: Dict[str, Any]) -> Song:
+    """
+    Build a song from a saved track, the same way as `Saved.get_metadata` does.
+
+    ### Arguments
+    - item: A saved track, with its "added_at" and "track".
+
+    ### Returns
+    - The song.
+    """
+
+    track_meta = item["track"]
+    album_meta = track_meta["album"]
+    release_date = album_meta["release_date"]
+    artists = [artist["name"] for artist in track_meta["artists"]]
+    images = album_meta["images"]
+
+    return Song.from_missing_data(
+        name=track_meta["name"],
+        artists=artists,
+        artist=artists[0],
+        artist_id=track_meta["artists"][0]["id"],
+        album_id=album_meta["id"],
+        album_name=album_meta["name"],
+        album_artist=album_meta["artists"][0]["name"],
+        album_type=album_meta["album_type"],
+        disc_number=track_meta["disc_number"],
+        duration=int(track_meta["duration_ms"] / 1000),
+        year=release_date[:4],
+        date=release_date,
+        track_number=track_meta["track_number"],
+        tracks_count=album_meta["total_tracks"],
+        song_id=track_meta["id"],
+        explicit=track_meta["explicit"],
+        url=track_meta["external_urls"]["spotify"],
+        isrc=track_meta.get("external_ids", {}).get("isrc"),
+        cover_url=(
+            max(
+                images,
+                key=lambda image: (image.get("width") or 0)
+                * (image.get("height") or 0),
+            )["url"]
+            if images
+            else None
+        ),
+    )
@@ -0,0 +1,145 @@
+"""
+Scheduler module for ordering jobs so short requests are not stuck behind library syncs.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, Optional
+
+from loguru import logger
+
+from settings.settings import (
+    BULK_LATENCY_TARGET,
+    INTERACTIVE_LATENCY_TARGET,
+    SMALL_JOB_MAX_SONGS,
+)
+from spotifyDownloader import SpotifyDownloader
+
+if TYPE_CHECKING:
+    from spotifyDownloader.jobs import Job
+
+__all__ = ["JobClass", "Scheduler", "INTERACTIVE", "BULK", "JOB_CLASSES"]
+
+
+@dataclass(frozen=True)
+class JobClass:
+    """
+    Scheduling class of a job.
+    latency_target is the maximum time, in seconds, a job of this class should wait to start.
+    """
+
+    name: str
+    latency_target: float
+
+
+INTERACTIVE = JobClass("interactive", INTERACTIVE_LATENCY_TARGET)
+BULK = JobClass("bulk", BULK_LATENCY_TARGET)
+JOB_CLASSES: Dict[str, JobClass] = {INTERACTIVE.name: INTERACTIVE, BULK.name: BULK}
+
+
+class Scheduler:
+    """
+    Size-aware scheduling policy for the job queue.
+
+    Jobs run earliest-deadline-first, where the deadline is the submission time plus
+    the latency target of their class. Bulk jobs never take every worker, and between
+    song batches they run a waiting interactive job, so quick requests start within
+    seconds while bulk jobs keep making steady progress.
+    """
+
+    def __init__(self, workers: int, small_job_max_songs: int = SMALL_JOB_MAX_SONGS):
+        self.bulk_slots = max(1, workers - 1)
+        self.small_job_max_songs = small_job_max_songs
+        self._stats: Dict[str, Dict[str, float]] = {
+            name: {"started": 0, "total_wait": 0.0, "max_wait": 0.0, "missed": 0}
+            for name in JOB_CLASSES
+        }
+
+    def classify(self, command: str, query: str, song_count: int | None = None) -> str:
+        """
+        Returns the class name of a job.
+        Single URLs are interactive until their song count is known.
+        Args:
+            command (str): "download", "sync" or "plan".
+            query (str): The Spotify URL or query.
+            song_count (int | None): Number of songs, once resolved.
+        Returns:
+            str: The class name.
+        """
+        if command == "sync":
+            return BULK.name
+        if song_count is not None:
+            if song_count <= self.small_job_max_songs:
+                return INTERACTIVE.name
+            return BULK.name
+        if (
+            SpotifyDownloader._is_spotify_track(query)
+            or SpotifyDownloader._is_spotify_album(query)
+            or SpotifyDownloader._is_spotify_playlist(query)
+            or SpotifyDownloader._is_spotify_artist(query)
+        ):
+            return INTERACTIVE.name
+        return BULK.name
+
+    @staticmethod
+    def deadline(job: "Job") -> float:
+        """
+        Returns the time by which the job should have started.
+        """
+        return job.created_at + JOB_CLASSES[job.job_class].latency_target
+
+    def select(
+        self, pending: Iterable["Job"], running: Iterable["Job"]
+    ) -> Optional["Job"]:
+        """
+        Returns the next pending job a free worker should run, or None if it should wait.
+        """
+        bulk_running = sum(1 for job in running if job.job_class == BULK.name)
+        candidates = [
+            job
+            for job in pending
+            if job.job_class != BULK.name or bulk_running < self.bulk_slots
+        ]
+        return min(candidates, key=self.deadline, default=None)
+
+    def preempting_job(self, job: "Job", pending: Iterable["Job"]) -> Optional["Job"]:
+        """
+        Returns the interactive job a bulk job should run before its next song batch, if any.
+        """
+        if job.job_class != BULK.name:
+            return None
+        interactive = [other for other in pending if other.job_class == INTERACTIVE.name]
+        return min(interactive, key=self.deadline, default=None)
+
+    def record_start(self, job: "Job") -> None:
+        """
+        Records how long the job waited and warns if its latency target was missed.
+        """
+        job_class = JOB_CLASSES[job.job_class]
+        wait = time.time() - job.created_at
+        stats = self._stats[job_class.name]
+        stats["started"] += 1
+        stats["total_wait"] += wait
+        stats["max_wait"] = max(stats["max_wait"], wait)
+        if wait > job_class.latency_target:
+            stats["missed"] += 1
+            logger.warning(
+                f"Job {job.id} ({job_class.name}) waited {wait:.0f}s, "
+                f"over its {job_class.latency_target:.0f}s target"
+            )
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns per-class wait statistics, including the latency target.
+        """
+        result = {}
+        for name, stats in self._stats.items():
+            started = stats["started"]
+            result[name] = {
+                "latency_target": JOB_CLASSES[name].latency_target,
+                "started": started,
+                "avg_wait": stats["total_wait"] / started if started else 0.0,
+                "max_wait": stats["max_wait"],
+                "missed": stats["missed"],
+            }
+        return result
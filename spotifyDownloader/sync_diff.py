@@ -0,0 +1,126 @@
+"""
+Sync diff module for computing the file changes of a sync entry.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from spotdl.types.song import Song
+from spotdl.utils.formatter import create_file_name
+
+__all__ = ["SyncDiff", "SyncPlan"]
+
+# A song within a sync entry: its URL and the list it was saved from
+SongKey = Tuple[str, Optional[str]]
+
+
+@dataclass
+class SyncPlan:
+    """
+    Changes needed to bring the files of a sync entry up to date.
+    """
+
+    query: str
+    to_add: List[Song] = field(default_factory=list)
+    to_delete: List[Path] = field(default_factory=list)
+    to_rename: List[Tuple[Path, Path]] = field(default_factory=list)
+    unchanged: int = 0
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Returns the counts and paths of the plan, e.g. to show a dry run.
+        """
+        return {
+            "query": self.query,
+            "add": len(self.to_add),
+            "delete": len(self.to_delete),
+            "rename": len(self.to_rename),
+            "unchanged": self.unchanged,
+            "deleted_paths": [str(path) for path in self.to_delete],
+            "renamed_paths": [[str(old), str(new)] for old, new in self.to_rename],
+        }
+
+
+class SyncDiff:
+    """
+    Computes the adds, deletes and renames between the stored songs of a sync entry
+    and its current songs in a single pass over both, indexed by URL and list.
+
+    A track may be saved in several lists of an entry, e.g. several playlists of
+    "all-user-playlists", and every list keeps its own copy, so each copy is
+    diffed on its own. File names are only computed for songs that were removed or
+    whose metadata changed; a song with the same metadata keeps the same file.
+    Computed paths are cached per song, so a path is formatted at most once per
+    diff.
+    """
+
+    def __init__(self, output: str, fmt: str, restrict: Any) -> None:
+        self.output = output
+        self.fmt = fmt
+        self.restrict = restrict
+        self._paths: Dict[Tuple[SongKey, bool], Path] = {}
+
+    def _path(self, key: SongKey, song: Song, new: bool) -> Path:
+        path = self._paths.get((key, new))
+        if path is None:
+            path = Path(create_file_name(song, self.output, self.fmt, self.restrict))
+            self._paths[(key, new)] = path
+        return path
+
+    def plan(
+        self, query: str, old_songs: List[Dict[str, Any]], new_songs: List[Song]
+    ) -> SyncPlan:
+        """
+        Computes the changes without touching the disk.
+        Args:
+            query (str): The query of the sync entry.
+            old_songs (List[dict]): The songs stored at the previous sync, as dicts.
+            new_songs (List[Song]): The current songs.
+        Returns:
+            SyncPlan: The plan.
+        """
+        plan = SyncPlan(query=query)
+
+        # A URL may appear several times in a list; the first occurrence wins
+        new_by_key: Dict[SongKey, Song] = {}
+        new_keys_by_url: Dict[str, List[SongKey]] = {}
+        for song in new_songs:
+            key = (song.url, song.list_name)
+            if key not in new_by_key:
+                new_by_key[key] = song
+                new_keys_by_url.setdefault(song.url, []).append(key)
+
+        old_keys = set()
+        for data in old_songs:
+            key = (data["url"], data.get("list_name"))
+            if key in old_keys:
+                continue
+            old_keys.add(key)
+            new_song = new_by_key.get(key)
+            if new_song is None:
+                old_path = self._path(key, Song.from_dict(data), new=False)
+                # Without the list in the output pattern, the copies of a track in
+                # other lists share its file
+                if not any(
+                    self._path(other, new_by_key[other], new=True) == old_path
+                    for other in new_keys_by_url.get(key[0], [])
+                ):
+                    plan.to_delete.append(old_path)
+                continue
+            # Song fields are plain values, so its __dict__ compares equal to its
+            # JSON without the deep copy made by `song.json`
+            if vars(new_song) == data:
+                plan.unchanged += 1
+                continue
+            old_path = self._path(key, Song.from_dict(data), new=False)
+            new_path = self._path(key, new_song, new=True)
+            if old_path != new_path:
+                plan.to_rename.append((old_path, new_path))
+            else:
+                plan.unchanged += 1
+
+        plan.to_add = [
+            song for key, song in new_by_key.items() if key not in old_keys
+        ]
+        return plan
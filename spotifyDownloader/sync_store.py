@@ -0,0 +1,193 @@
+"""
+Sync store module with the sync entries and their songs, stored in SQLite.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from loguru import logger
+
+from settings.settings import CACHE_DIR
+
+__all__ = ["SyncStore", "SYNC_DB_PATH", "SYNC_JSON_PATH"]
+
+SYNC_DB_PATH = f"{CACHE_DIR}/sync.sqlite"
+
+# Previous format of the sync entries, migrated on first use
+SYNC_JSON_PATH = f"{CACHE_DIR}/sync.spotdl"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    sync_type TEXT NOT NULL,
+    query TEXT NOT NULL,
+    output TEXT NOT NULL,
+    snapshots TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (sync_type, query)
+);
+CREATE TABLE IF NOT EXISTS songs (
+    sync_type TEXT NOT NULL,
+    query TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (sync_type, query, position),
+    FOREIGN KEY (sync_type, query) REFERENCES entries (sync_type, query)
+        ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS songs_url ON songs (url);
+"""
+
+
+class SyncStore:
+    """
+    Sync entries grouped by sync type ("playlists", "albums", "saved"...), each with
+    its query, output pattern, playlist snapshots and songs.
+
+    Every entry is updated in its own transaction and only its rows are rewritten,
+    so a download no longer parses and rewrites the sync entries of the whole library.
+    Entries are returned in the same dict format as the previous JSON sync file.
+    """
+
+    def __init__(self, path: str = SYNC_DB_PATH, json_path: str = SYNC_JSON_PATH):
+        self.path = path
+        self.json_path = Path(json_path)
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Opens the database on first use and migrates the JSON sync file if present.
+        Must be called with the store lock held.
+        """
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+            self._migrate_json()
+        return self._conn
+
+    def _migrate_json(self) -> None:
+        """
+        Imports the entries of the JSON sync file in a single transaction,
+        then renames the file so it is only imported once.
+        """
+        if not self.json_path.exists():
+            return
+        try:
+            with open(self.json_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.error(f"Error reading sync file {self.json_path}: {e}")
+            return
+        count = 0
+        with self._conn:
+            for sync_type, entries in data.items():
+                for entry in entries:
+                    self._upsert(sync_type, entry)
+                    count += 1
+        os.replace(self.json_path, self.json_path.with_suffix(".spotdl.migrated"))
+        logger.info(f"Migrated {count} sync entries from {self.json_path}")
+
+    def _upsert(self, sync_type: str, entry: Dict[str, Any]) -> None:
+        """
+        Replaces an entry and its songs. Must be called inside a transaction.
+        """
+        key = (sync_type, entry["query"])
+        snapshots = entry.get("snapshots")
+        self._conn.execute(
+            "INSERT INTO entries (sync_type, query, output, snapshots, updated_at) "
+            "VALUES (?, ?, ?, ?, ?) ON CONFLICT (sync_type, query) DO UPDATE SET "
+            "output = excluded.output, snapshots = excluded.snapshots, "
+            "updated_at = excluded.updated_at",
+            (
+                *key,
+                entry["output"],
+                json.dumps(snapshots) if snapshots else None,
+                time.time(),
+            ),
+        )
+        self._conn.execute("DELETE FROM songs WHERE sync_type = ? AND query = ?", key)
+        self._conn.executemany(
+            "INSERT INTO songs (sync_type, query, position, url, data) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                (*key, position, song["url"], json.dumps(song, ensure_ascii=False))
+                for position, song in enumerate(entry["songs"])
+            ),
+        )
+
+    def upsert(self, sync_type: str, entry: Dict[str, Any]) -> None:
+        """
+        Adds or replaces a sync entry atomically.
+        Args:
+            sync_type (str): The group of the entry, e.g. "playlists".
+            entry (dict): The entry, with "query", "songs", "output" and "snapshots".
+        """
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                self._upsert(sync_type, entry)
+
+    def get_entries(self, sync_type: str) -> List[Dict[str, Any]]:
+        """
+        Returns the entries of a sync type with their songs.
+        Args:
+            sync_type (str): The group of the entries, e.g. "playlists".
+        Returns:
+            List[dict]: The entries, in the order they were first added.
+        """
+        with self._lock:
+            conn = self._connect()
+            entries = conn.execute(
+                "SELECT query, output, snapshots FROM entries "
+                "WHERE sync_type = ? ORDER BY rowid",
+                (sync_type,),
+            ).fetchall()
+            result = []
+            for query, output, snapshots in entries:
+                songs = conn.execute(
+                    "SELECT data FROM songs WHERE sync_type = ? AND query = ? "
+                    "ORDER BY position",
+                    (sync_type, query),
+                ).fetchall()
+                result.append(
+                    {
+                        "type": "sync",
+                        "query": query,
+                        "songs": [json.loads(data) for (data,) in songs],
+                        "output": output,
+                        "snapshots": json.loads(snapshots) if snapshots else None,
+                    }
+                )
+        return result
+
+    def sync_types(self) -> List[str]:
+        """
+        Returns the sync types that have at least one entry.
+        """
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute("SELECT DISTINCT sync_type FROM entries").fetchall()
+        return [sync_type for (sync_type,) in rows]
+
+    def is_empty(self) -> bool:
+        """
+        Returns True if there are no sync entries at all.
+        """
+        with self._lock:
+            conn = self._connect()
+            return conn.execute("SELECT 1 FROM entries LIMIT 1").fetchone() is None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,19 @@
+import os
+import tempfile
+
+# settings exits without the required variables and creates its directories on
+# import, so point everything at a scratch directory before any test imports it
+_root = tempfile.mkdtemp(prefix="spotdl-bot-tests-")
+for name, value in {
+    "RUNNING_IN_DOCKER": "1",
+    "TELEGRAM_TOKEN": "test",
+    "TELEGRAM_ADMIN": "1",
+    "SPOTIFY_CLIENT_ID": "test",
+    "SPOTIFY_CLIENT_SECRET": "test",
+    "SPOTIFY_REDIRECT_URI": "http://127.0.0.1:9900/",
+    "DOWNLOAD_DIR": f"{_root}/music",
+    "CACHE_DIR": f"{_root}/cache",
+    "LOG_DIR": f"{_root}/logs",
+    "LOCALE_DIR": os.path.join(os.path.dirname(__file__), "..", "locale"),
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import pytest
+
+from spotifyDownloader import sync_diff
+from spotifyDownloader.sync_diff import SyncDiff
+
+
+class FakeSong:
+    def __init__(self, url, list_name, title="T"):
+        self.url = url
+        self.list_name = list_name
+        self.title = title
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+@pytest.fixture(autouse=True)
+def fake_spotdl(monkeypatch):
+    monkeypatch.setattr(sync_diff, "Song", FakeSong)
+    monkeypatch.setattr(
+        sync_diff,
+        "create_file_name",
+        lambda song, output, fmt, restrict: Path(
+            output.format(list_name=song.list_name, title=song.title) + f".{fmt}"
+        ),
+    )
+
+
+def old(url, list_name, title="T"):
+    return vars(FakeSong(url, list_name, title))
+
+
+def plan(old_songs, new_songs, output="Playlists/{list_name}/{title}"):
+    return SyncDiff(output, "mp3", None).plan("q", old_songs, new_songs)
+
+
+def test_removed_track_deletes_every_copy():
+    result = plan([old("u1", "A"), old("u1", "B")], [])
+    assert result.to_delete == [
+        Path("Playlists/A/T.mp3"),
+        Path("Playlists/B/T.mp3"),
+    ]
+
+
+def test_track_removed_from_one_list_deletes_its_copy():
+    result = plan([old("u1", "A"), old("u1", "B")], [FakeSong("u1", "A")])
+    assert result.to_delete == [Path("Playlists/B/T.mp3")]
+    assert result.to_rename == []
+    assert result.unchanged == 1
+
+
+def test_track_added_to_another_list_is_an_add():
+    new_song = FakeSong("u1", "B")
+    result = plan([old("u1", "A")], [FakeSong("u1", "A"), new_song])
+    assert result.to_add == [new_song]
+    assert result.unchanged == 1
+
+
+def test_renamed_track_renames_every_copy():
+    result = plan(
+        [old("u1", "A"), old("u1", "B")],
+        [FakeSong("u1", "A", "T2"), FakeSong("u1", "B", "T2")],
+    )
+    assert result.to_rename == [
+        (Path("Playlists/A/T.mp3"), Path("Playlists/A/T2.mp3")),
+        (Path("Playlists/B/T.mp3"), Path("Playlists/B/T2.mp3")),
+    ]
+
+
+def test_shared_file_is_kept_while_another_list_has_the_track():
+    result = plan([old("u1", "A"), old("u1", "B")], [FakeSong("u1", "A")], "{title}")
+    assert result.to_delete == []